@@ -0,0 +1,151 @@
+"""
+Runs the speaker embedding model of the pyannote pipeline with ONNX Runtime.
+
+Speaker embeddings dominate the diarization time of long audio. Exported to ONNX
+and quantized to int8, the embedding model moves half the bytes and runs on the
+int8 paths of the hardware.
+"""
+
+# standard library imports
+import copy
+import logging
+import os
+
+# 3rd party imports
+import numpy as np
+import torch
+
+try:
+    import onnxruntime
+except ImportError:  # onnxruntime is optional, only needed for ONNX embeddings
+    onnxruntime = None
+
+# current package imports
+from .exceptions import DiarizeError
+
+# execution providers in order of preference, unavailable ones are skipped
+ONNX_PROVIDERS = ["CUDAExecutionProvider", "CPUExecutionProvider"]
+# shape of the dummy batch models are traced with: 10s chunks at 16kHz, weighted
+# per frame of the segmentation model as the pipeline does
+_EXPORT_NUM_SAMPLES = 160000
+_EXPORT_NUM_FRAMES = 589
+
+
+class OnnxSpeakerEmbedding:
+    """
+    Drop-in replacement for the speaker embedding of a pyannote pipeline, running
+    an exported model with ONNX Runtime. Attributes other than the embedding call
+    itself (dimension, metric, sample rate, ...) are read from the replaced
+    embedding.
+    """
+
+    def __init__(self, embedding, onnx_path: str) -> None:
+        """
+        Parameters
+        ----------
+        embedding
+            The pipeline's pyannote speaker embedding, e.g. pipeline._embedding.
+        onnx_path : str
+            Path to the model exported by export_embedding_to_onnx().
+        """
+        if onnxruntime is None:
+            msg = (
+                "onnxruntime is required for ONNX speaker embeddings, install "
+                "ai-clips-maker[onnx]."
+            )
+            logging.error(msg)
+            raise DiarizeError(msg)
+
+        self._embedding = embedding
+        available = onnxruntime.get_available_providers()
+        providers = [p for p in ONNX_PROVIDERS if p in available]
+        self._session = onnxruntime.InferenceSession(onnx_path, providers=providers)
+
+    def __getattr__(self, name: str):
+        # private attributes are never delegated, e.g. '_embedding' itself when
+        # copy or pickle create an instance without calling __init__
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._embedding, name)
+
+    def __call__(
+        self,
+        waveforms: torch.Tensor,
+        masks: torch.Tensor = None,
+    ) -> np.ndarray:
+        """
+        Computes the speaker embeddings of a batch of waveforms.
+
+        Parameters
+        ----------
+        waveforms : torch.Tensor
+            Waveforms of shape (batch_size, num_channels, num_samples).
+        masks : torch.Tensor, optional
+            Frame weights of shape (batch_size, num_frames). Defaults to weighting
+            all frames equally, with as many frames per sample as the segmentation
+            model produces.
+
+        Returns
+        -------
+        np.ndarray
+            Embeddings of shape (batch_size, dimension).
+        """
+        if masks is None:
+            num_frames = max(
+                round(waveforms.shape[-1] * _EXPORT_NUM_FRAMES / _EXPORT_NUM_SAMPLES), 1
+            )
+            masks = torch.ones(waveforms.shape[0], num_frames)
+        (embeddings,) = self._session.run(
+            None,
+            {
+                "waveform": waveforms.detach().cpu().float().numpy(),
+                "weights": masks.detach().cpu().float().numpy(),
+            },
+        )
+        return embeddings
+
+
+def export_embedding_to_onnx(
+    embedding,
+    output_path: str,
+    quantize: bool = True,
+) -> None:
+    """
+    Exports the model of a pyannote speaker embedding to ONNX, to be loaded with
+    OnnxSpeakerEmbedding. Run once offline, e.g. on the '_embedding' of a loaded
+    PyannoteDiarizer pipeline.
+
+    Parameters
+    ----------
+    embedding
+        The pipeline's pyannote speaker embedding, e.g. pipeline._embedding.
+    output_path : str
+        Path of the exported model.
+    quantize : bool
+        Quantize the weights of the exported model to int8.
+    """
+    # export a copy, the pipeline's model stays on its device
+    model = copy.deepcopy(embedding.model_).cpu().eval()
+    waveforms = torch.zeros(1, 1, _EXPORT_NUM_SAMPLES)
+    weights = torch.ones(1, _EXPORT_NUM_FRAMES)
+    float_path = output_path + ".fp32" if quantize else output_path
+
+    torch.onnx.export(
+        model,
+        (waveforms, weights),
+        float_path,
+        input_names=["waveform", "weights"],
+        output_names=["embedding"],
+        dynamic_axes={
+            "waveform": {0: "batch_size", 2: "num_samples"},
+            "weights": {0: "batch_size", 1: "num_frames"},
+            "embedding": {0: "batch_size"},
+        },
+    )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(float_path, output_path, weight_type=QuantType.QInt8)
+        os.remove(float_path)
+    logging.debug(f"Exported speaker embedding model to '{output_path}'.")
@@ -5,24 +5,65 @@ This module provides an interface for performing speaker diarization on audio
 files using the pre-trained "pyannote/speaker-diarization-3.1" model hosted on HuggingFace.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import gc
 import logging
-import os
-import uuid
 
+import numpy as np
 import torch
 from pyannote.audio import Pipeline
 from pyannote.core.annotation import Annotation
 
+from .exceptions import DiarizeError
+from .onnx_embedding import OnnxSpeakerEmbedding
 from ai_clips_maker.media.audio_file import AudioFile
 from ai_clips_maker.utils.pytorch import get_compute_device, assert_compute_device_available
 
+# sample rate the pyannote 3.1 pipeline's models run at
+PYANNOTE_SAMPLE_RATE = 16000
+
+
+def _speaker_index(label: str) -> int:
+    """
+    Returns the index of a pyannote speaker label (e.g. 2 for 'SPEAKER_02'), or -1
+    if the label has none.
+    """
+    index = label.split("_")[1]
+    return int(index) if index else -1
+
+
+def _autocast_forward(model: torch.nn.Module) -> None:
+    """
+    Runs the forward pass of 'model' under CUDA float16 autocast and returns its
+    output as float32, so only the model itself runs in half precision.
+    """
+    forward = model.forward
+
+    @functools.wraps(forward)
+    def autocast_forward(*args, **kwargs):
+        with torch.autocast(device_type="cuda", dtype=torch.float16):
+            output = forward(*args, **kwargs)
+        return output.float()
+
+    model.forward = autocast_forward
+
 
 class PyannoteDiarizer:
     """
     Wrapper for the pyannote speaker diarization pipeline.
     """
 
-    def __init__(self, auth_token: str, device: str = None) -> None:
+    def __init__(
+        self,
+        auth_token: str,
+        device: str = None,
+        mixed_precision: bool = True,
+        segmentation_step: float = None,
+        embedding_batch_size: int = None,
+        clustering_threshold: float = None,
+        embedding_onnx_path: str = None,
+    ) -> None:
         """
         Initialize the diarization pipeline.
 
@@ -33,15 +74,60 @@ class PyannoteDiarizer:
         device : str, optional
             Device to run inference on (e.g., 'cpu', 'cuda').
             Defaults to auto-detected device.
+        mixed_precision : bool
+            Run the forward passes of the segmentation and embedding models in
+            float16 on CUDA devices. Their outputs are cast back to float32, so
+            aggregation and clustering still run in float32.
+        segmentation_step : float, optional
+            Step of the sliding segmentation window as a fraction of its duration.
+            Coarser steps (e.g. 0.5) produce fewer speaker embeddings, the most
+            expensive stage on long audio. Defaults to the pipeline's step.
+        embedding_batch_size : int, optional
+            Number of speaker embeddings computed per batch. Defaults to the
+            pipeline's batch size.
+        clustering_threshold : float, optional
+            Speaker clustering threshold, may need retuning with a coarser
+            segmentation step. Defaults to the pipeline's threshold.
+        embedding_onnx_path : str, optional
+            Path to a speaker embedding model exported by export_embedding_to_onnx(),
+            run with ONNX Runtime instead of the pipeline's PyTorch model. Requires
+            the 'onnx' extra.
         """
         if device is None:
             device = get_compute_device()
         assert_compute_device_available(device)
+        self._device = torch.device(device)
 
         self.pipeline = Pipeline.from_pretrained(
             "pyannote/speaker-diarization-3.1",
             use_auth_token=auth_token,
-        ).to(torch.device(device))
+        ).to(self._device)
+
+        if segmentation_step is not None:
+            self.pipeline.segmentation_step = segmentation_step
+            # the segmentation inference was set up with the original step
+            segmentation = self.pipeline._segmentation
+            segmentation.step = segmentation_step * segmentation.duration
+        if embedding_batch_size is not None:
+            self.pipeline.embedding_batch_size = embedding_batch_size
+        if clustering_threshold is not None:
+            self.pipeline.clustering.threshold = clustering_threshold
+        if embedding_onnx_path is not None:
+            self.pipeline._embedding = OnnxSpeakerEmbedding(
+                self.pipeline._embedding, embedding_onnx_path
+            )
+
+        if mixed_precision and self._device.type == "cuda":
+            # float16 runs the models' convolutions and matmuls on tensor cores
+            _autocast_forward(self.pipeline._segmentation.model)
+            if embedding_onnx_path is None:
+                _autocast_forward(self.pipeline._embedding.model_)
+
+        if self._device.type == "cuda":
+            # the models run on fixed size chunks, so the convolution algorithms cuDNN
+            # benchmarks on the first chunk are reused for all others. The setting is
+            # process-wide
+            torch.backends.cudnn.benchmark = True
 
         logging.debug(f"Initialized pyannote pipeline on device: {device}")
 
@@ -68,31 +154,86 @@ class PyannoteDiarizer:
         list[dict]
             List of speaker segments, each with keys: 'speakers', 'start_time', 'end_time'.
         """
-        if audio_file.has_file_extension("wav"):
-            wav_file = audio_file
-        else:
-            wav_path = os.path.join(
-                audio_file.get_parent_dir_path(),
-                f"{audio_file.get_filename_without_extension()}_{uuid.uuid4().hex}.wav",
-            )
-            wav_file = audio_file.extract_audio(
-                extracted_audio_file_path=wav_path,
-                audio_codec="pcm_s16le",
-                overwrite=False,
-            )
+        samples = self._decode_samples(audio_file)
+        return self._diarize_samples(
+            audio_file, samples, min_segment_duration, time_precision
+        )
+
+    def diarize_many(
+        self,
+        audio_files: list[AudioFile],
+        min_segment_duration: float = 1.5,
+        time_precision: int = 6,
+    ) -> list[list[dict]]:
+        """
+        Perform speaker diarization on multiple audio files. The next file is
+        decoded on a worker thread while the current one is diarized, so decoding
+        doesn't leave the device idle between files.
+
+        Parameters
+        ----------
+        audio_files : list[AudioFile]
+            The input audio files.
+        min_segment_duration : float
+            Minimum duration (in seconds) for a valid segment.
+        time_precision : int
+            Decimal precision for timestamps.
+
+        Returns
+        -------
+        list[list[dict]]
+            The speaker segments of each audio file, in the order of 'audio_files'.
+        """
+        segments = []
+        # decode at most one file ahead, decoded audio can be large
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_samples = None
+            if audio_files:
+                next_samples = executor.submit(self._decode_samples, audio_files[0])
+            for i, audio_file in enumerate(audio_files):
+                samples = next_samples.result()
+                if i + 1 < len(audio_files):
+                    next_samples = executor.submit(
+                        self._decode_samples, audio_files[i + 1]
+                    )
+                segments.append(self._diarize_samples(
+                    audio_file, samples, min_segment_duration, time_precision
+                ))
+        return segments
 
-        annotation: Annotation = self.pipeline({"audio": wav_file.path})
+    def _decode_samples(self, audio_file: AudioFile) -> np.ndarray:
+        """
+        Decodes the audio once into memory at the pipeline's sample rate, so pyannote
+        doesn't decode and resample each chunk from a file.
+        """
+        samples = audio_file.decode_samples(PYANNOTE_SAMPLE_RATE, num_channels=1)
+        if samples is None:
+            msg = f"Failed to decode the audio of '{audio_file.path}' for diarization."
+            logging.error(msg)
+            raise DiarizeError(msg)
+        return samples
+
+    def _diarize_samples(
+        self,
+        audio_file: AudioFile,
+        samples: np.ndarray,
+        min_segment_duration: float,
+        time_precision: int,
+    ) -> list[dict]:
+        """
+        Runs the pipeline on the decoded samples of 'audio_file'.
+        """
+        with torch.inference_mode():
+            annotation: Annotation = self.pipeline({
+                "waveform": torch.from_numpy(samples),
+                "sample_rate": PYANNOTE_SAMPLE_RATE,
+            })
         duration = audio_file.get_duration()
 
-        segments = self._adjust_segments(
+        return self._adjust_segments(
             annotation, duration, min_segment_duration, time_precision
         )
 
-        if wav_file is not audio_file:
-            wav_file.delete()
-
-        return segments
-
     def _adjust_segments(
         self,
         annotation: Annotation,
@@ -108,46 +249,44 @@ class PyannoteDiarizer:
         list[dict]
             Cleaned list of speaker segments.
         """
-        segments = []
-        unique_speakers = set()
-
-        cur_start = 0.0
-        cur_speaker = None
-        cur_end = None
-
-        for segment, _, label in annotation.itertracks(yield_label=True):
-            start, end = segment.start, segment.end
-            if end - start < min_segment_duration:
-                continue
-
-            speaker = int(label.split("_")[1]) if label.split("_")[1] else None
-
-            if cur_speaker is None:
-                cur_speaker = speaker
-                cur_end = end
-                continue
-
-            if cur_speaker == speaker:
-                cur_end = max(cur_end, end)
-                continue
-
-            segments.append({
-                "speakers": [cur_speaker] if cur_speaker is not None else [],
-                "start_time": round(cur_start, time_precision),
-                "end_time": round(start, time_precision),
-            })
-            unique_speakers.add(cur_speaker)
+        tracks = list(annotation.itertracks(yield_label=True))
+        starts = np.fromiter(
+            (segment.start for segment, _, _ in tracks), dtype=float, count=len(tracks)
+        )
+        ends = np.fromiter(
+            (segment.end for segment, _, _ in tracks), dtype=float, count=len(tracks)
+        )
+        # -1 marks labels without a speaker index
+        speakers = np.fromiter(
+            (_speaker_index(label) for _, _, label in tracks),
+            dtype=np.int64,
+            count=len(tracks),
+        )
 
-            cur_speaker = speaker
-            cur_start = start
-            cur_end = end
+        valid = ends - starts >= min_segment_duration
+        starts, speakers = starts[valid], speakers[valid]
 
-        segments.append({
-            "speakers": [cur_speaker] if cur_speaker is not None else [],
-            "start_time": round(cur_start, time_precision),
-            "end_time": round(duration, time_precision),
-        })
-        unique_speakers.add(cur_speaker)
+        # consecutive tracks of the same speaker merge into one segment, which lasts
+        # until the next speaker starts. The first starts at 0, the last ends with
+        # the audio
+        if len(speakers) == 0:
+            run_starts = np.zeros(1, dtype=np.int64)
+            speakers = np.full(1, -1, dtype=np.int64)
+        else:
+            run_starts = np.flatnonzero(np.r_[True, speakers[1:] != speakers[:-1]])
+        run_speakers = speakers[run_starts].tolist()
+        segment_starts = [0.0] + starts[run_starts[1:]].tolist()
+        segment_ends = starts[run_starts[1:]].tolist() + [duration]
+
+        segments = [
+            {
+                "speakers": [speaker] if speaker >= 0 else [],
+                "start_time": round(start, time_precision),
+                "end_time": round(end, time_precision),
+            }
+            for speaker, start, end in zip(run_speakers, segment_starts, segment_ends)
+        ]
+        unique_speakers = {speaker for speaker in run_speakers if speaker >= 0}
 
         return self._relabel_speakers(segments, unique_speakers)
 
@@ -164,13 +303,24 @@ class PyannoteDiarizer:
         list[dict]
             Segments with remapped speaker labels.
         """
-        if not unique_speakers:
+        speakers = sorted(s for s in unique_speakers if s is not None)
+        if not speakers:
             return segments
 
-        mapping = {old: new for new, old in enumerate(sorted(unique_speakers))}
+        # lookup table from old to new labels, indexed by the old label
+        lut = np.full(speakers[-1] + 1, -1, dtype=np.int64)
+        lut[speakers] = np.arange(len(speakers))
+
+        # segments have at most one speaker, -1 marks segments without one
+        labels = np.fromiter(
+            (seg["speakers"][0] if seg["speakers"] else -1 for seg in segments),
+            dtype=np.int64,
+            count=len(segments),
+        )
+        new_labels = np.where(labels >= 0, lut[labels], -1).tolist()
 
-        for segment in segments:
-            segment["speakers"] = [mapping[s] for s in segment["speakers"]]
+        for segment, label in zip(segments, new_labels):
+            segment["speakers"] = [label] if label >= 0 else []
 
         return segments
 
@@ -180,5 +330,7 @@ class PyannoteDiarizer:
         """
         del self.pipeline
         self.pipeline = None
+        # collect reference cycles first so the cache release covers their tensors
+        gc.collect()
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
@@ -2,14 +2,27 @@
 Handles directory-level operations within the local file system.
 """
 
+from collections.abc import Iterator
 import os
 import shutil
 import logging
+import stat
 
 from ai_clips_maker.filesys.object import FileSystemObject
 from ai_clips_maker.filesys.file import File
 
 
+def _move(src_path: str, dst_path: str) -> None:
+    """
+    Moves 'src_path' to 'dst_path' with a single rename when both are on the same
+    file system, copying only across file systems.
+    """
+    try:
+        os.replace(src_path, dst_path)
+    except OSError:
+        shutil.move(src_path, dst_path)
+
+
 class Dir(FileSystemObject):
     """
     Represents a directory in the local file system and provides utilities for
@@ -36,7 +49,7 @@ class Dir(FileSystemObject):
         msg = super().check_exists()
         if msg:
             return msg
-        if not os.path.isdir(self._path):
+        if not stat.S_ISDIR(self._stat().st_mode):
             return f"'{self._path}' is a valid {super().get_type()} but not a valid {self.get_type()}."
         return None
 
@@ -45,56 +58,84 @@ class Dir(FileSystemObject):
         self.assert_does_not_exist()
         self.get_parent_dir().assert_exists()
         os.mkdir(self._path)
+        self._invalidate_stat()
 
     def delete(self) -> None:
         """Deletes the directory and all its contents."""
         self.assert_exists()
         shutil.rmtree(self._path)
+        self._invalidate_stat()
         logging.debug(f"Directory '{self._path}' deleted.")
 
     def move(self, new_path: str) -> None:
         """Moves the directory to a new location."""
         self.assert_exists()
         Dir(new_path).assert_does_not_exist()
-        shutil.move(self._path, new_path)
+        _move(self._path, new_path)
         self._path = new_path
+        self._invalidate_stat()
         logging.debug(f"Directory moved to '{new_path}'.")
 
     def get_parent_dir(self) -> Dir:
         """Returns the parent directory object."""
         return Dir(self.get_parent_dir_path())
 
+    def _iter_entries(self) -> Iterator[os.DirEntry]:
+        """
+        Yields the os.scandir() entries of the directory. The entries' types come
+        from the directory listing (d_type), only symlinks are stat'ed to resolve
+        their target's type.
+        """
+        self.assert_exists()
+        with os.scandir(self._path) as entries:
+            yield from entries
+
     def scan_dir(self) -> list[FileSystemObject]:
         """Returns a list of all FileSystemObjects in the directory."""
-        self.assert_exists()
         objects = []
-        for entry in os.scandir(self._path):
-            entry_path = os.path.join(self._path, entry.name)
+        for entry in self._iter_entries():
             if entry.is_file():
-                fs_object = File(entry_path)
+                objects.append(File.from_dir_entry(entry))
             elif entry.is_dir():
-                fs_object = Dir(entry_path)
-            else:
-                continue
-            fs_object.assert_exists()
-            objects.append(fs_object)
+                objects.append(Dir.from_dir_entry(entry))
         return objects
 
     def get_files(self) -> list[File]:
         """Returns all file objects within the directory."""
-        return [obj for obj in self.scan_dir() if isinstance(obj, File)]
+        return [File.from_dir_entry(e) for e in self._iter_entries() if e.is_file()]
 
     def get_subdirs(self) -> list[Dir]:
         """Returns all subdirectory objects within the directory."""
-        return [obj for obj in self.scan_dir() if isinstance(obj, Dir)]
+        return [Dir.from_dir_entry(e) for e in self._iter_entries() if e.is_dir()]
 
     def get_files_with_extension(self, extension: str) -> list[File]:
         """Returns all file objects in the directory with the given extension."""
-        return [f for f in self.get_files() if f.get_file_extension() == extension]
+        return [
+            File.from_dir_entry(entry)
+            for entry in self._iter_files_with_extension(extension)
+        ]
 
     def get_file_paths_with_extension(self, extension: str) -> list[str]:
         """Returns paths of all files in the directory with the given extension."""
-        return [f.path for f in self.get_files_with_extension(extension)]
+        return [entry.path for entry in self._iter_files_with_extension(extension)]
+
+    def _iter_files_with_extension(self, extension: str) -> Iterator[os.DirEntry]:
+        """
+        Yields the entries of the files with the given extension, matched on their
+        names before any File object is created.
+        """
+        suffix = f".{extension}"
+        for entry in self._iter_entries():
+            # str.endswith() rejects most names cheaply, splitext() then confirms the
+            # same extension as File.get_file_extension(), leading dots of hidden
+            # files don't start an extension
+            name = entry.name
+            if (
+                name.endswith(suffix)
+                and os.path.splitext(name)[1] == suffix
+                and entry.is_file()
+            ):
+                yield entry
 
     def zip(self, zip_file_name: str) -> File:
         """
@@ -113,25 +154,37 @@ class Dir(FileSystemObject):
         self.assert_exists()
         zip_path = shutil.make_archive(zip_file_name, "zip", self._path)
         final_path = os.path.join(self.get_parent_dir_path(), f"{zip_file_name}.zip")
-        shutil.move(zip_path, final_path)
+        _move(zip_path, final_path)
         return File(final_path)
 
     def delete_contents(self) -> None:
         """Deletes all contents inside the directory without deleting the directory itself."""
-        for file in self.get_files():
-            file.delete()
-        for subdir in self.get_subdirs():
-            subdir.delete()
+        self._delete_entries(self._iter_entries())
 
     def delete_contents_except_asset(self) -> None:
         """
         Deletes all contents inside the directory except files
         starting with 'media_file_to_transcode'.
         """
-        for file in self.get_files():
-            if file.get_filename().startswith("media_file_to_transcode"):
-                logging.debug(f"Skipping deletion of '{file.get_filename()}'")
+        entries = []
+        for entry in self._iter_entries():
+            if entry.name.startswith("media_file_to_transcode") and entry.is_file():
+                logging.debug(f"Skipping deletion of '{entry.name}'")
+                continue
+            entries.append(entry)
+        self._delete_entries(entries)
+
+    def _delete_entries(self, entries: Iterator[os.DirEntry]) -> None:
+        """
+        Deletes files and directories of a single directory listing. Symlinks are
+        removed rather than followed.
+        """
+        # finish the listing before modifying the directory
+        for entry in list(entries):
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            elif entry.is_file() or entry.is_symlink():
+                os.remove(entry.path)
+            else:
                 continue
-            file.delete()
-        for subdir in self.get_subdirs():
-            subdir.delete()
+            logging.debug(f"'{entry.path}' deleted.")
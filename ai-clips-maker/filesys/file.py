@@ -8,10 +8,87 @@ Notes
 
 import os
 import logging
+import shutil
+import stat
+from functools import lru_cache
 import magic
 from ai_clips_maker.filesys.object import FileSystemObject
 from ai_clips_maker.filesys.exceptions import FileError
 
+# loading the libmagic database is expensive, so share a single instance
+_MIME_MAGIC = magic.Magic(mime=True)
+
+# number of leading bytes read when sniffing a file's primary MIME type
+_SNIFF_NUM_BYTES = 16
+
+# leading byte signatures of common media formats and their primary MIME type
+_MAGIC_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image"),
+    (b"\xff\xd8\xff", "image"),
+    (b"GIF87a", "image"),
+    (b"GIF89a", "image"),
+    (b"ID3", "audio"),
+    (b"fLaC", "audio"),
+    (b"\xff\xfb", "audio"),
+    (b"\xff\xf3", "audio"),
+    (b"\xff\xf2", "audio"),
+    (b"\x1a\x45\xdf\xa3", "video"),
+    (b"FLV\x01", "video"),
+)
+
+# RIFF container form types (bytes 8-12)
+_RIFF_FORM_TYPES = {
+    b"WAVE": "audio",
+    b"AVI ": "video",
+    b"WEBP": "image",
+}
+
+# ISO base media file ("ftyp") major brands that aren't video (bytes 8-12)
+_FTYP_BRANDS = {
+    b"M4A ": "audio",
+    b"M4B ": "audio",
+    b"heic": "image",
+    b"heix": "image",
+    b"avif": "image",
+    b"mif1": "image",
+}
+
+
+def _sniff_mime_primary_type(header: bytes) -> str | None:
+    """
+    Returns the primary MIME type of a file from its leading bytes, or None if the
+    format isn't recognized.
+    """
+    if header[:4] == b"RIFF":
+        return _RIFF_FORM_TYPES.get(header[8:12])
+    if header[4:8] == b"ftyp":
+        return _FTYP_BRANDS.get(header[8:12], "video")
+    for signature, primary_type in _MAGIC_SIGNATURES:
+        if header.startswith(signature):
+            return primary_type
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _get_mime_type(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Returns the MIME type of the file at 'path'. The modification time and size
+    are part of the cache key so that a changed file is sniffed again.
+    """
+    return _MIME_MAGIC.from_file(path)
+
+
+@lru_cache(maxsize=1024)
+def _split_filename(filename: str) -> tuple[str, str | None]:
+    """
+    Splits a file name into its name without extension and its extension (None if it
+    has none). Same result as os.path.splitext, leading dots don't start an extension.
+    """
+    head, sep, tail = filename.rpartition(".")
+    if not sep or not head.strip("."):
+        return filename, None
+    return head, tail
+
 
 class File(FileSystemObject):
     """
@@ -39,38 +116,61 @@ class File(FileSystemObject):
 
     def get_filename_without_extension(self) -> str:
         """Returns the file name without its extension."""
-        return os.path.splitext(self.get_filename())[0]
+        return _split_filename(self.get_filename())[0]
 
     def get_file_extension(self) -> str | None:
         """Returns the file extension, or None if it doesn't exist."""
-        _, ext = os.path.splitext(self._path)
-        return ext[1:] if ext else None
+        return _split_filename(self.get_filename())[1]
 
     def get_file_size(self) -> int:
         """Returns file size in bytes."""
         self.assert_exists()
-        return os.path.getsize(self._path)
+        return self._stat().st_size
 
     def get_mime_type(self) -> str:
         """Returns the full MIME type of the file (e.g., text/plain)."""
         self.assert_exists()
-        mime = magic.Magic(mime=True)
-        return mime.from_file(self._path)
+        return self._get_mime_type()
 
     def get_mime_primary_type(self) -> str:
-        """Returns the primary MIME type (e.g., 'text' from 'text/plain')."""
-        return self.get_mime_type().split("/")[0]
+        """
+        Returns the primary MIME type (e.g., 'text' from 'text/plain'). Common media
+        formats are recognized from the file header, libmagic is used otherwise.
+        """
+        self.assert_exists()
+        return self._get_mime_primary_type()
 
     def get_mime_secondary_type(self) -> str:
         """Returns the secondary MIME type (e.g., 'plain' from 'text/plain')."""
-        return self.get_mime_type().split("/")[1]
+        return self.get_mime_parts()[1]
+
+    def get_mime_parts(self) -> tuple[str, str]:
+        """
+        Returns the primary and secondary MIME types (e.g., ('text', 'plain') from
+        'text/plain') from a single MIME type lookup.
+        """
+        primary_type, _, secondary_type = self.get_mime_type().partition("/")
+        return primary_type, secondary_type
+
+    def _get_mime_type(self) -> str:
+        """get_mime_type() without checking that the file exists first."""
+        file_stat = self._stat()
+        return _get_mime_type(self._path, file_stat.st_mtime_ns, file_stat.st_size)
+
+    def _get_mime_primary_type(self) -> str:
+        """get_mime_primary_type() without checking that the file exists first."""
+        with open(self._path, "rb") as f:
+            primary_type = _sniff_mime_primary_type(f.read(_SNIFF_NUM_BYTES))
+        if primary_type is not None:
+            return primary_type
+        return self._get_mime_type().partition("/")[0]
 
     def check_exists(self) -> str | None:
         """Checks if the file exists and is a file. Returns None if valid, error message otherwise."""
         msg = super().check_exists()
         if msg is not None:
             return msg
-        if not os.path.isfile(self._path):
+        if not stat.S_ISREG(self._stat().st_mode):
             return f"'{self._path}' exists but is not a valid file."
         return None
 
@@ -79,22 +179,36 @@ class File(FileSystemObject):
         self.assert_does_not_exist()
         with open(self._path, "x") as f:
             f.write(data)
+        self._invalidate_stat()
         self.assert_exists()
 
+    def create_bytes(self, data: bytes) -> None:
+        """
+        Creates a new file with the given binary content. Raises if file already
+        exists. Opening with "xb" already fails if the file can't be created, so the
+        file isn't checked again afterwards.
+        """
+        self.assert_does_not_exist()
+        with open(self._path, "xb") as f:
+            f.write(data)
+        self._invalidate_stat()
+
     def delete(self) -> None:
         """Deletes the file if it exists."""
         if not self.exists():
             logging.warning(f"File '{self._path}' does not exist.")
             return
         os.remove(self._path)
+        self._invalidate_stat()
         logging.debug(f"File '{self._path}' deleted.")
 
     def move(self, new_path: str) -> None:
         """Moves the file to a new location."""
         self.assert_exists()
         File(new_path).assert_does_not_exist()
-        os.rename(self._path, new_path)
+        shutil.move(self._path, new_path)
         self._path = new_path
+        self._invalidate_stat()
 
     def check_has_file_extension(self, extension: str) -> str | None:
         """Returns error message if file doesn't have the expected extension, None if okay."""
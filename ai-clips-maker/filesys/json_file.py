@@ -6,11 +6,47 @@ A utility class for working with JSON files in the local file system.
 from __future__ import annotations
 import json
 
+# 3rd party imports
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
 # current package imports
 from .file import File
 
-# local imports
-from ai_clips_maker.utils.type_checker import TypeChecker
+# orjson only indents by 2 spaces, the standard library writes the same layout
+JSON_INDENT = 2
+if orjson is not None:
+    ORJSON_OPTIONS = (
+        orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+
+def _orjson_default(obj):
+    """
+    Serializes the objects orjson doesn't support natively, e.g. NumPy scalars
+    outside of OPT_SERIALIZE_NUMPY's types.
+    """
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(data: dict) -> bytes:
+    """
+    Serializes 'data' to JSON with orjson if it's installed, otherwise with the
+    standard library. Data orjson rejects, e.g. ints wider than 64 bits, falls back
+    to the standard library. NaN and infinity are written as null by orjson.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_orjson_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, indent=JSON_INDENT).encode("utf-8")
 
 
 class JSONFile(File):
@@ -83,11 +119,10 @@ class JSONFile(File):
         ------
         TypeError: If the data is not a dictionary.
         """
-        type_checker = TypeChecker()
-        type_checker.assert_type(data, "data", dict)
+        self._type_checker.assert_type(data, "data", dict)
+        self.assert_has_file_extension("json")
 
-        super().create(json.dumps(data, indent=4))
-        self.assert_exists()
+        self.create_bytes(_dumps(data))
 
     def read(self) -> dict:
         """
@@ -105,8 +140,16 @@ class JSONFile(File):
         """
         self.assert_exists()
 
-        with open(self._path, "r", encoding="utf-8") as file:
-            return json.load(file)
+        with open(self._path, "rb") as file:
+            raw = file.read()
+
+        if orjson is not None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # the standard library also reads the NaN and infinity it writes
+                pass
+        return json.loads(raw)
 
     def write(self, new_data: dict) -> None:
         """
@@ -123,8 +166,10 @@ class JSONFile(File):
         """
         self.assert_exists()
 
-        type_checker = TypeChecker()
-        type_checker.assert_type(new_data, "data", dict)
+        self._type_checker.assert_type(new_data, "data", dict)
+
+        payload = _dumps(new_data)
 
-        with open(self._path, "w", encoding="utf-8") as file:
-            json.dump(new_data, file, indent=4)
+        with open(self._path, "wb") as file:
+            file.write(payload)
+        self._invalidate_stat()
@@ -8,6 +8,10 @@ from ai_clips_maker.filesys.exceptions import FileSystemObjectError
 from ai_clips_maker.utils.type_checker import TypeChecker
 
 
+# sentinel marking that the object has not been stat'ed yet
+_NOT_STATED = object()
+
+
 class FileSystemObject:
     """
     Base class for working with file system objects (like files and directories).
@@ -16,6 +20,8 @@ class FileSystemObject:
     ----------
     _path : str
         Absolute path of the object in the file system.
+    _stat_result : os.stat_result | None
+        Result of the last os.stat call on the path, None if it didn't exist.
     """
 
     def __init__(self, path: str) -> None:
@@ -30,6 +36,27 @@ class FileSystemObject:
         self._type_checker = TypeChecker()
         self._type_checker.assert_type(path, "path", str)
         self._path = path
+        self._stat_result = _NOT_STATED
+
+    @classmethod
+    def from_dir_entry(cls, entry: os.DirEntry):
+        """
+        Creates the object from an os.scandir() entry. The entry's full path is
+        reused and the object isn't stat'ed until one of its methods needs it, on
+        Linux DirEntry.stat() is a syscall even though the entry's type is known
+        from the directory listing.
+
+        Parameters
+        ----------
+        entry : os.DirEntry
+            Directory entry of the object.
+
+        Returns
+        -------
+        FileSystemObject
+            An instance of the class the method is called on.
+        """
+        return cls(entry.path)
 
     @property
     def path(self) -> str:
@@ -51,6 +78,7 @@ class FileSystemObject:
         """
         self._type_checker.assert_type(new_path, "new_path", str)
         self._path = new_path
+        self._invalidate_stat()
 
     def get_type(self) -> str:
         """
@@ -83,7 +111,7 @@ class FileSystemObject:
         str | None
             None if it exists, error message otherwise.
         """
-        if not os.path.exists(self._path):
+        if self._stat(refresh=True) is None:
             return f"{self.get_type()} '{self._path}' does not exist."
         return None
 
@@ -127,3 +155,32 @@ class FileSystemObject:
         if msg:
             logging.error(msg)
             raise FileSystemObjectError(msg)
+
+    def _stat(self, refresh: bool = False) -> os.stat_result | None:
+        """
+        Returns the os.stat result of the object, reusing the last result unless
+        'refresh' is True. check_exists() always refreshes, so methods called after
+        an existence check can read size, type, etc. without another syscall.
+
+        Parameters
+        ----------
+        refresh : bool
+            Whether to stat the path again instead of using the cached result.
+
+        Returns
+        -------
+        os.stat_result | None
+            The stat result, None if the path does not exist.
+        """
+        if refresh or self._stat_result is _NOT_STATED:
+            try:
+                self._stat_result = os.stat(self._path)
+            except (OSError, ValueError):
+                self._stat_result = None
+        return self._stat_result
+
+    def _invalidate_stat(self) -> None:
+        """
+        Discards the cached stat result, e.g. after the object was modified.
+        """
+        self._stat_result = _NOT_STATED
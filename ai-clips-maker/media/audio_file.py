@@ -8,7 +8,12 @@ import subprocess
 from .temporal_media_file import TemporalMediaFile
 from ai_clips_maker.filesys.file import File
 
+import av
+import numpy as np
+
 SUCCESS = 0
+# named channel layouts of decoded audio, others are given by their channel count
+_CHANNEL_LAYOUTS = {1: "mono", 2: "stereo"}
 
 
 class AudioFile(TemporalMediaFile):
@@ -22,15 +27,14 @@ class AudioFile(TemporalMediaFile):
     def get_type(self) -> str:
         return "AudioFile"
 
-    def check_exists(self) -> str | None:
-        msg = super().check_exists()
+    def _check_exists(self) -> str | None:
+        msg = super()._check_exists()
         if msg:
             return msg
 
-        temp_file = TemporalMediaFile(self._path)
-        if not temp_file.has_audio_stream():
+        if not self._has_audio_stream():
             return f"'{self._path}' has no audio stream — not a valid {self.get_type()}."
-        if not temp_file.is_audio_only():
+        if self._has_video_stream():
             return (
                 f"'{self._path}' is not audio-only — not a valid {self.get_type()}. "
                 "Use AudioVideoFile instead."
@@ -39,14 +43,17 @@ class AudioFile(TemporalMediaFile):
         return None
 
     def get_bitrate(self) -> int | None:
-        return int(self.get_stream_info("a:0", "bit_rate"))
+        bitrate = self.get_stream_info("a:0", "bit_rate")
+        if bitrate is None:
+            return None
+        return int(bitrate)
 
     def extract_audio(
         self,
         output_path: str,
         codec: str,
         overwrite: bool = True,
-    ) -> AudioFile | None:
+    ) -> "AudioFile | None":
         self.assert_exists()
 
         if overwrite:
@@ -64,6 +71,7 @@ class AudioFile(TemporalMediaFile):
         cmd = [
             "ffmpeg",
             "-y",
+            "-hide_banner", "-nostats", "-loglevel", "error",
             "-i", self.path,
             "-c:a", codec,
             "-vn",  # strip video
@@ -71,15 +79,69 @@ class AudioFile(TemporalMediaFile):
             "-map", "a",
             output_path,
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
 
         if result.returncode != SUCCESS:
+            stderr = result.stderr.decode("utf-8", errors="replace")
             logging.error(
                 f"[extract_audio] Failed\nReturn code: {result.returncode}\n"
-                f"Output: {result.stdout}\nError: {result.stderr}"
+                f"Error: {stderr}"
             )
             return None
 
         audio = AudioFile(output_path)
         audio.assert_exists()
         return audio
+
+    def decode_samples(
+        self,
+        sample_rate: int,
+        num_channels: int = 1,
+    ) -> np.ndarray | None:
+        """
+        Decodes the first audio stream into memory in-process with PyAV, resampled
+        and downmixed, without spawning ffmpeg or writing an intermediate file.
+
+        Parameters
+        ----------
+        sample_rate: int
+            Sample rate of the decoded audio in Hz.
+        num_channels: int
+            Number of channels of the decoded audio.
+
+        Returns
+        -------
+        np.ndarray | None
+            float32 samples in [-1, 1] of shape (num_channels, num_samples), or None
+            if decoding failed.
+        """
+        self.assert_exists()
+
+        # planar float frames convert to arrays of shape (num_channels, num_samples)
+        resampler = av.AudioResampler(
+            format="fltp",
+            layout=_CHANNEL_LAYOUTS.get(num_channels, f"{num_channels}c"),
+            rate=sample_rate,
+        )
+        chunks = []
+        try:
+            with av.open(self.path) as container:
+                if not container.streams.audio:
+                    logging.error(
+                        f"[decode_samples] '{self.path}' has no audio stream to decode."
+                    )
+                    return None
+                stream = container.streams.audio[0]
+                for frame in container.decode(stream):
+                    chunks.extend(f.to_ndarray() for f in resampler.resample(frame))
+                # flush the samples buffered by the resampler
+                chunks.extend(f.to_ndarray() for f in resampler.resample(None))
+        except av.error.FFmpegError as e:
+            logging.error(f"[decode_samples] Failed to decode '{self.path}': {e}")
+            return None
+
+        if not chunks:
+            return np.zeros((num_channels, 0), dtype=np.float32)
+        return np.concatenate(chunks, axis=1)
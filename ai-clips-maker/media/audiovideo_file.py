@@ -51,7 +51,7 @@ class AudioVideoFile(AudioFile, VideoFile):
         """
         return "AudioVideoFile"
 
-    def check_exists(self) -> str or None:
+    def _check_exists(self) -> str or None:
         """
         Checks that the AudioVideoFile exists in the file system. Returns None if so, a
         descriptive error message if not.
@@ -66,25 +66,25 @@ class AudioVideoFile(AudioFile, VideoFile):
             None if the AudioVideoFile exists in the file system, a descriptive error
             message if not.
         """
-        # check if it's a temporal media file
-        temporal_media_file = TemporalMediaFile(self._path)
-        error = temporal_media_file.check_exists()
+        # check if it's a temporal media file, skipping the audio-only and video-only
+        # checks of the AudioFile and VideoFile parents
+        error = TemporalMediaFile._check_exists(self)
         if error:
             return error
 
         # check if it's an audio file
-        if temporal_media_file.has_audio_stream() is False:
+        if self._has_audio_stream() is False:
             return (
                 "'{}' is a valid {} but has no audio stream so it is not a valid {} "
                 "file."
-                "".format(self._path, temporal_media_file.get_type(), self.get_type())
+                "".format(self._path, TemporalMediaFile.get_type(self), self.get_type())
             )
         # check if it's a video file
-        if temporal_media_file.has_video_stream() is False:
+        if self._has_video_stream() is False:
             return (
                 "'{}' is a valid {} but has no video stream so it is not a valid {} "
                 "file."
-                "".format(self._path, temporal_media_file.get_type(), self.get_type())
+                "".format(self._path, TemporalMediaFile.get_type(self), self.get_type())
             )
 
     def get_bitrate(self, stream) -> str or None:
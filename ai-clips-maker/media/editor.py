@@ -1,7 +1,9 @@
 import logging
 import subprocess
 import os
+import shutil
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 # Imports from current package
 from .exceptions import MediaEditorError
@@ -20,6 +22,12 @@ from ai_clips_maker.utils.type_checker import TypeChecker
 
 SUCCESS = 0  # Return code from ffmpeg indicating success
 
+# media file classes that MediaEditor outputs, looked up by the exact input type
+_MEDIA_FILE_TYPES = {
+    media_file_type: media_file_type
+    for media_file_type in (VideoFile, AudioFile, ImageFile, AudioVideoFile)
+}
+
 class MediaEditor:
     """
     A class for handling media file editing operations using FFmpeg.
@@ -82,6 +90,47 @@ class MediaEditor:
         TemporalMediaFile or None
             A media file object representing the trimmed (and possibly resized) media.
         """
+        input_args, output_args = self._prepare_trim(
+            media_file, start_time, end_time, trimmed_media_file_path, overwrite,
+            video_codec, audio_codec, crf, preset, num_threads,
+            crop_width, crop_height, crop_x,
+        )
+
+        # Execute FFmpeg command
+        err = self._run_ffmpeg(input_args, output_args, trimmed_media_file_path)
+        if err is not None:
+            logging.error(f"Trimming media file '{media_file.path}' to '{trimmed_media_file_path}' was unsuccessful. Details: {err}")
+            return None
+        else:
+            trimmed_media_file = self._create_media_file_of_same_type(trimmed_media_file_path, media_file)
+            trimmed_media_file.assert_exists()
+            return trimmed_media_file
+
+    def _prepare_trim(
+        self,
+        media_file: TemporalMediaFile,
+        start_time: float,
+        end_time: float,
+        trimmed_media_file_path: str,
+        overwrite: bool,
+        video_codec: str,
+        audio_codec: str,
+        crf: str,
+        preset: str,
+        num_threads: str,
+        crop_width: int or None,
+        crop_height: int or None,
+        crop_x: int or None,
+    ) -> tuple[list[str], list[str]]:
+        """
+        Validates a trim and builds its ffmpeg input and output arguments. See trim()
+        for the parameters.
+
+        Returns
+        -------
+        tuple[list[str], list[str]]
+            The input arguments and the output arguments of the ffmpeg command.
+        """
         # Validate the input media file
         self.assert_valid_media_file(media_file, TemporalMediaFile)
         if overwrite:
@@ -96,33 +145,96 @@ class MediaEditor:
         start_time_hms = seconds_to_hms_time_format(start_time)
         duration_hms = seconds_to_hms_time_format(duration_secs)
 
-        ffmpeg_command = [
-            "ffmpeg", "-y", "-ss", start_time_hms, "-t", duration_hms,
-            "-i", media_file.path, "-c:v", video_codec, "-preset", preset,
-            "-c:a", audio_codec, "-map", "0", "-crf", crf, "-threads", num_threads
+        input_args = ["-ss", start_time_hms, "-t", duration_hms, "-i", media_file.path]
+        output_args = [
+            "-c:v", video_codec, "-preset", preset, "-c:a", audio_codec,
+            "-map", "0", "-crf", crf, "-threads", num_threads
         ]
 
-        # Add cropping filter if specified
-        if crop_width and crop_height and crop_x:
+        # Add cropping filter if specified, cropping happens in the same ffmpeg run
+        if None not in (crop_width, crop_height, crop_x):
             logging.debug("Trim with resizing.")
             original_height = int(media_file.get_stream_info("v", "height"))
             crop_y = max(original_height // 2 - crop_height // 2, 0)
             crop_filter = f"crop={crop_width}:{crop_height}:{crop_x}:{crop_y}"
-            ffmpeg_command.extend(["-vf", crop_filter])
+            output_args.extend(["-vf", crop_filter])
 
-        # Output file path
-        ffmpeg_command.append(trimmed_media_file_path)
+        return input_args, output_args
 
-        # Execute FFmpeg command
-        result = subprocess.run(ffmpeg_command, capture_output=True, text=True)
-        msg = f"Terminal return code: '{result.returncode}'\nOutput: '{result.stdout}'\nErr Output: '{result.stderr}'\n"
-        if result.returncode != SUCCESS:
-            logging.error(f"Trimming media file '{media_file.path}' to '{trimmed_media_file_path}' was unsuccessful. Details: {msg}")
-            return None
-        else:
+    def trim_many(
+        self,
+        media_file: TemporalMediaFile,
+        clips: list[tuple[float, float, str]],
+        *,
+        max_parallel: int = None,
+        overwrite: bool = True,
+        video_codec: str = "copy",
+        audio_codec: str = "copy",
+        crf: str = "23",
+        preset: str = "medium",
+        num_threads: str = "2",
+    ) -> list[TemporalMediaFile or None]:
+        """
+        Trims several clips out of the same media file, running the ffmpeg processes
+        concurrently.
+
+        Parameters
+        ----------
+        media_file : TemporalMediaFile
+            The media file to trim.
+        clips : list[tuple[float, float, str]]
+            The clips to create, as (start_time, end_time, trimmed_media_file_path).
+        max_parallel : int
+            Maximum number of ffmpeg processes running at once. Defaults to half the
+            number of CPUs.
+        overwrite : bool
+            Whether to overwrite existing files at the trimmed media file paths.
+        video_codec : str
+            Codec used for video compression.
+        audio_codec : str
+            Codec used for audio compression.
+        crf : str
+            Constant rate factor for video quality.
+        preset : str
+            Preset for encoding speed and compression.
+        num_threads : str
+            The number of threads each ffmpeg process uses. Kept low since the clips
+            are already processed in parallel.
+
+        Returns
+        -------
+        list[TemporalMediaFile or None]
+            The trimmed media files in the order of 'clips', None for failed trims.
+        """
+        # Validate every clip before spawning any ffmpeg process
+        jobs = []
+        for start_time, end_time, trimmed_media_file_path in clips:
+            input_args, output_args = self._prepare_trim(
+                media_file, start_time, end_time, trimmed_media_file_path, overwrite,
+                video_codec, audio_codec, crf, preset, num_threads, None, None, None,
+            )
+            jobs.append((input_args, output_args, trimmed_media_file_path))
+        if len(jobs) == 0:
+            return []
+
+        if max_parallel is None:
+            max_parallel = max((os.cpu_count() or 2) // 2, 1)
+        max_parallel = min(max_parallel, len(jobs))
+
+        # The threads only wait on their ffmpeg process, the work happens in ffmpeg
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            errs = list(executor.map(lambda job: self._run_ffmpeg(*job), jobs))
+
+        trimmed_media_files = []
+        for (_, _, trimmed_media_file_path), err in zip(jobs, errs):
+            if err is not None:
+                logging.error(f"Trimming media file '{media_file.path}' to '{trimmed_media_file_path}' was unsuccessful. Details: {err}")
+                trimmed_media_files.append(None)
+                continue
             trimmed_media_file = self._create_media_file_of_same_type(trimmed_media_file_path, media_file)
             trimmed_media_file.assert_exists()
-            return trimmed_media_file
+            trimmed_media_files.append(trimmed_media_file)
+        return trimmed_media_files
 
     def copy_temporal_media_file(
         self,
@@ -168,6 +280,24 @@ class MediaEditor:
             logging.error(f"Can't retrieve duration from media file '{media_file.path}'")
             raise MediaEditorError(f"Can't retrieve duration from media file '{media_file.path}'")
 
+        # A full-length stream copy into the same container keeps the source's
+        # streams and container, so copying the file itself skips ffmpeg's demux and
+        # remux. A different extension needs ffmpeg to remux into the new container
+        same_container = (
+            os.path.splitext(media_file.path)[1].lower()
+            == os.path.splitext(copied_media_file_path)[1].lower()
+        )
+        if video_codec == "copy" and audio_codec == "copy" and same_container:
+            if overwrite:
+                self._file_system_manager.assert_parent_dir_exists(MediaFile(copied_media_file_path))
+            else:
+                self._file_system_manager.assert_valid_path_for_new_fs_object(copied_media_file_path)
+            self._file_system_manager.assert_paths_not_equal(media_file.path, copied_media_file_path, "media_file path", "copied_media_file_path")
+            shutil.copyfile(media_file.path, copied_media_file_path)
+            copied_media_file = self._create_media_file_of_same_type(copied_media_file_path, media_file)
+            copied_media_file.assert_exists()
+            return copied_media_file
+
         return self.trim(
             media_file,
             0,
@@ -247,6 +377,11 @@ class MediaEditor:
         self.assert_valid_media_file(watermark_file, ImageFile)
 
         # Validate paths and watermark properties
+        if overwrite:
+            self._file_system_manager.assert_parent_dir_exists(VideoFile(watermarked_video_file_path))
+        else:
+            self._file_system_manager.assert_valid_path_for_new_fs_object(watermarked_video_file_path)
+        self._file_system_manager.assert_paths_not_equal(video_file.path, watermarked_video_file_path, "video_file path", "watermarked_video_file_path")
         if size_dim not in ["h", "w"]:
             raise MediaEditorError(f"Invalid size_dim '{size_dim}'. Must be 'h' or 'w'.")
         if watermark_to_video_ratio_size_dim <= 0:
@@ -257,29 +392,98 @@ class MediaEditor:
         # Check trimming validity
         self._assert_valid_trim_times(video_file, start_time, end_time)
 
-        # Prepare FFmpeg watermarking and cropping command
-        return self.watermark_and_crop_video(
-            video_file,
-            watermark_file,
-            watermarked_video_file_path,
-            size_dim,
-            watermark_to_video_ratio_size_dim,
-            x,
-            y,
-            opacity,
-            overwrite,
-            start_time,
-            end_time,
-            video_codec,
-            audio_codec,
-            crf,
-            preset,
-            num_threads,
-            crop_x,
-            crop_y,
-            crop_width,
-            crop_height
+        # Prepare FFmpeg watermarking and cropping command, trimming, cropping and
+        # watermarking all happen in a single ffmpeg run
+        input_args = []
+        if start_time is not None and end_time is not None:
+            input_args.extend([
+                "-ss", seconds_to_hms_time_format(start_time),
+                "-t", seconds_to_hms_time_format(end_time - start_time),
+            ])
+        input_args.extend(["-i", video_file.path, "-i", watermark_file.path])
+
+        # Crop the video first so the watermark is positioned and sized relative to
+        # the output frame
+        filters = []
+        background = "[0:v]"
+        video_width = video_file.get_width_pixels()
+        video_height = video_file.get_height_pixels()
+        if None not in (crop_x, crop_y, crop_width, crop_height):
+            logging.debug("Watermark with cropping.")
+            filters.append(
+                f"[0:v]crop={crop_width}:{crop_height}:{crop_x}:{crop_y}[bg]"
+            )
+            background = "[bg]"
+            video_width, video_height = crop_width, crop_height
+
+        if size_dim == "h":
+            watermark_scale = f"-1:{int(video_height * watermark_to_video_ratio_size_dim)}"
+        else:
+            watermark_scale = f"{int(video_width * watermark_to_video_ratio_size_dim)}:-1"
+        filters.append(
+            f"[1:v]scale={watermark_scale},format=rgba,"
+            f"colorchannelmixer=aa={opacity}[wm]"
         )
+        filters.append(f"{background}[wm]overlay={x}:{y}[out]")
+
+        output_args = [
+            "-filter_complex", ";".join(filters),
+            "-map", "[out]", "-map", "0:a?",
+            "-c:v", video_codec, "-preset", preset, "-crf", crf,
+            "-c:a", audio_codec, "-threads", num_threads,
+        ]
+
+        # Execute FFmpeg command
+        err = self._run_ffmpeg(input_args, output_args, watermarked_video_file_path)
+        if err is not None:
+            logging.error(
+                f"Watermarking video file '{video_file.path}' to "
+                f"'{watermarked_video_file_path}' was unsuccessful. Details: {err}"
+            )
+            return None
+
+        watermarked_video_file = self._create_media_file_of_same_type(
+            watermarked_video_file_path, video_file
+        )
+        watermarked_video_file.assert_exists()
+        return watermarked_video_file
+
+    def _run_ffmpeg(
+        self,
+        input_args: list[str],
+        output_args: list[str],
+        output_file_path: str,
+    ) -> str or None:
+        """
+        Runs a single ffmpeg command, overwriting 'output_file_path'. ffmpeg only
+        logs errors, its stdout is discarded and its stderr is only decoded on failure.
+
+        Parameters
+        ----------
+        input_args : list[str]
+            Input options and '-i' inputs of the command.
+        output_args : list[str]
+            Filter, mapping and codec options applied to the output.
+        output_file_path : str
+            Path of the output file.
+
+        Returns
+        -------
+        str or None
+            None if ffmpeg succeeded, a description of the failure otherwise.
+        """
+        result = subprocess.run(
+            [
+                "ffmpeg", "-y", "-hide_banner", "-nostats", "-loglevel", "error",
+                *input_args, *output_args, output_file_path,
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        if result.returncode != SUCCESS:
+            stderr = result.stderr.decode("utf-8", errors="replace")
+            return f"Terminal return code: '{result.returncode}'\nErr Output: '{stderr}'\n"
+        return None
 
     def _create_media_file_of_same_type(
         self,
@@ -301,13 +505,10 @@ class MediaEditor:
         MediaFile
             A new MediaFile object of the same type as `media_file_to_copy_type_of`.
         """
-        if isinstance(media_file_to_copy_type_of, VideoFile):
-            return VideoFile(file_path_to_create_media_file_from)
-        elif isinstance(media_file_to_copy_type_of, AudioFile):
-            return AudioFile(file_path_to_create_media_file_from)
-        elif isinstance(media_file_to_copy_type_of, ImageFile):
-            return ImageFile(file_path_to_create_media_file_from)
-        elif isinstance(media_file_to_copy_type_of, AudioVideoFile):
-            return AudioVideoFile(file_path_to_create_media_file_from)
-        else:
-            raise MediaEditorError("Unsupported media file type.")
+        # exact type lookup, an AudioVideoFile is also an instance of VideoFile
+        media_file_type = _MEDIA_FILE_TYPES.get(type(media_file_to_copy_type_of))
+        if media_file_type is None:
+            msg = f"Unsupported media file type '{type(media_file_to_copy_type_of).__name__}'."
+            logging.error(msg)
+            raise MediaEditorError(msg)
+        return media_file_type(file_path_to_create_media_file_from)
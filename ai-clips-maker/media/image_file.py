@@ -35,7 +35,7 @@ class ImageFile(MediaFile):
         """
         return "ImageFile"
 
-    def check_exists(self) -> None:
+    def _check_exists(self) -> None:
         """
         Checks if the image file exists in the file system and ensures it’s a valid image file.
 
@@ -47,13 +47,12 @@ class ImageFile(MediaFile):
             Returns None if the image exists, otherwise returns an error message.
         """
         # First check if it's a valid media file
-        error_msg = super().check_exists()
+        error_msg = super()._check_exists()
         if error_msg:
             return error_msg
 
         # Ensure the file is specifically an image file
-        media_file = MediaFile(self._path)
-        if media_file.has_audio_stream():
+        if self._has_audio_stream():
             return f"'{self._path}' is a valid media file but contains audio, making it invalid as an ImageFile."
 
         return None
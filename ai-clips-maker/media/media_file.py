@@ -5,6 +5,12 @@ Handles general media file operations (audio, video, image).
 import json
 import logging
 import subprocess
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
 
 from ai_clips_maker.filesys.file import File
 from ai_clips_maker.filesys.manager import FileSystemManager
@@ -13,6 +19,67 @@ from .exceptions import NoAudioStreamError, NoVideoStreamError
 SUCCESS = 0
 FALSE = 0
 
+# ffprobe stream specifier types and the codec_type they select
+STREAM_SPECIFIER_TYPES = {
+    "v": "video",
+    "a": "audio",
+    "s": "subtitle",
+    "d": "data",
+    "t": "attachment",
+}
+
+
+class _ProbeFailedError(Exception):
+    """
+    Raised by _probe_media() when ffprobe fails, so the failure isn't cached.
+    """
+
+
+@lru_cache(maxsize=256)
+def _probe_media(path: str, mtime_ns: int, size: int) -> dict:
+    """
+    Runs ffprobe once on 'path' and returns its streams and format information. The
+    modification time and size are part of the cache key so that a changed file is
+    probed again. Raises _ProbeFailedError if ffprobe fails, which lru_cache doesn't
+    keep, so a transient failure is retried on the next call.
+    """
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-print_format", "json",
+         "-show_streams", "-show_format", path],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    if result.returncode != SUCCESS:
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        logging.error(f"ffprobe failed on '{path}': {stderr}")
+        raise _ProbeFailedError(stderr)
+    # parse the raw UTF-8 bytes, no need to decode into an intermediate str
+    if orjson is not None:
+        return orjson.loads(result.stdout)
+    return json.loads(result.stdout)
+
+
+class _MediaCheckFailedError(Exception):
+    """
+    Raised by _check_media_file_exists() when the file isn't valid, so the failed
+    check isn't cached. Its argument is the error message.
+    """
+
+
+@lru_cache(maxsize=2048)
+def _check_media_file_exists(
+    media_class: type, path: str, mtime_ns: int, size: int
+) -> None:
+    """
+    Validates the file at 'path' as a 'media_class'. Validation sniffs the file type
+    and inspects its streams, so passing checks are memoized per version of the file
+    (its modification time and size). Raises _MediaCheckFailedError if the check
+    fails, which lru_cache doesn't keep, so a check failed by a transient ffprobe
+    failure is retried on the next call.
+    """
+    msg = media_class(path)._check_exists()
+    if msg is not None:
+        raise _MediaCheckFailedError(msg)
+
 
 class MediaFile(File):
     """
@@ -22,16 +89,38 @@ class MediaFile(File):
     def __init__(self, media_path: str) -> None:
         super().__init__(media_path)
         self._fs_manager = FileSystemManager()
+        # ffprobe results of this file keyed on its (mtime_ns, size) fingerprint
+        self._probe_cache: dict[tuple[int, int], dict] = {}
 
     def get_type(self) -> str:
         return "MediaFile"
 
     def check_exists(self) -> str | None:
+        """
+        Checks that the file exists and is a valid media file of this type. A passing
+        check is memoized until the file's modification time or size changes, failed
+        checks are repeated.
+        """
+        media_stat = self._stat(refresh=True)
+        if media_stat is None:
+            return self._check_exists()
+        try:
+            _check_media_file_exists(
+                type(self), self._path, media_stat.st_mtime_ns, media_stat.st_size
+            )
+        except _MediaCheckFailedError as e:
+            return str(e)
+        return None
+
+    def _check_exists(self) -> str | None:
+        """
+        Uncached implementation of check_exists(), extended by subclasses.
+        """
         msg = super().check_exists()
         if msg is not None:
             return msg
 
-        mime_type = File(self._path).get_mime_primary_type()
+        mime_type = self._get_mime_primary_type()
         if mime_type not in ["audio", "video", "image"]:
             return (
                 f"'{self._path}' is not a valid MediaFile. Detected type: '{mime_type}'"
@@ -40,30 +129,45 @@ class MediaFile(File):
 
     def get_format_info(self, field: str) -> str | None:
         self.assert_exists()
-        result = subprocess.run(
-            ["ffprobe", "-v", "error", "-show_entries", f"format={field}",
-             "-of", "default=noprint_wrappers=1:nokey=1", self._path],
-            capture_output=True, text=True
-        )
-        info = result.stdout.strip()
-        if result.returncode != SUCCESS or not info:
-            logging.error(f"ffprobe format query failed: {result.stderr.strip()}")
+        return self._get_format_info(field)
+
+    def _get_format_info(self, field: str) -> str | None:
+        """get_format_info() without validating the media file first."""
+        probe = self._probe()
+        info = None if probe is None else probe.get("format", {}).get(field)
+        if info is None or info == "":
+            logging.error(f"ffprobe format query for '{field}' failed on '{self._path}'.")
             return None
-        return info
+        return str(info)
 
     def get_stream_info(self, stream: str, field: str) -> str | None:
         self.assert_exists()
-        result = subprocess.run(
-            ["ffprobe", "-v", "quiet", "-select_streams", stream,
-             "-show_entries", f"stream={field}",
-             "-of", "default=noprint_wrappers=1:nokey=1", self._path],
-            capture_output=True, text=True
-        )
-        info = result.stdout.strip()
-        if result.returncode != SUCCESS:
-            logging.error(f"ffprobe stream query failed: {result.stderr.strip()}")
+        return self._get_stream_info(stream, field)
+
+    def _get_stream_info(self, stream: str, field: str) -> str | None:
+        """get_stream_info() without validating the media file first."""
+        probe = self._probe()
+        if probe is None:
+            logging.error(f"ffprobe stream query for '{field}' failed on '{self._path}'.")
+            return None
+
+        codec_type, _, index = stream.partition(":")
+        if codec_type not in STREAM_SPECIFIER_TYPES:
+            logging.error(f"Invalid stream specifier '{stream}'.")
+            return None
+        streams = [
+            s for s in probe.get("streams", [])
+            if s.get("codec_type") == STREAM_SPECIFIER_TYPES[codec_type]
+        ]
+        if index:
+            streams = streams[int(index):int(index) + 1]
+        infos = [str(s[field]) for s in streams if field in s]
+        if not infos:
+            logging.error(
+                f"No '{stream}' stream of '{self._path}' has the field '{field}'."
+            )
             return None
-        return info
+        return "\n".join(infos)
 
     def get_path(self) -> str:
         self.assert_exists()
@@ -71,16 +175,52 @@ class MediaFile(File):
 
     def get_streams(self) -> list[dict]:
         self.assert_exists()
-        result = subprocess.run(
-            ["ffprobe", "-v", "quiet", "-print_format", "json",
-             "-show_streams", self._path],
-            capture_output=True, text=True
-        )
-        if result.returncode != SUCCESS:
-            logging.error(f"ffprobe stream retrieval failed: {result.stderr.strip()}")
+        return self._get_streams()
+
+    def _get_streams(self) -> list[dict]:
+        """
+        get_streams() without validating the media file first. Used by the validation
+        itself, which would otherwise recurse through assert_exists().
+        """
+        probe = self._probe()
+        if probe is None:
             return []
+        return list(probe.get("streams", []))
 
-        return json.loads(result.stdout).get("streams", [])
+    def _has_audio_stream(self) -> bool:
+        """has_audio_stream() without validating the media file first."""
+        return any(s.get("codec_type") == "audio" for s in self._get_streams())
+
+    def _has_video_stream(self) -> bool:
+        """has_video_stream() without validating the media file first."""
+        for stream in self._get_streams():
+            if (
+                stream.get("codec_type") == "video"
+                and stream.get("disposition", {}).get("attached_pic") != FALSE
+            ):
+                return True
+        return False
+
+    def _probe(self) -> dict | None:
+        """
+        Returns the ffprobe streams and format information of the media file. All
+        stream and format accessors share this result, so a file is only probed once
+        until it changes on disk. The result is also kept on the instance so it
+        survives eviction from the shared cache.
+        """
+        media_stat = self._stat()
+        if media_stat is None:
+            return None
+        fingerprint = (media_stat.st_mtime_ns, media_stat.st_size)
+        probe = self._probe_cache.get(fingerprint)
+        if probe is None:
+            try:
+                probe = _probe_media(self._path, *fingerprint)
+            except _ProbeFailedError:
+                return None
+            # only the current fingerprint is worth keeping
+            self._probe_cache = {fingerprint: probe}
+        return probe
 
     def get_audio_streams(self) -> list[dict]:
         return [s for s in self.get_streams() if s.get("codec_type") == "audio"]
@@ -102,10 +242,8 @@ class MediaFile(File):
         return self.check_has_audio_stream() is None
 
     def has_video_stream(self) -> bool:
-        for stream in self.get_video_streams():
-            if stream.get("disposition", {}).get("attached_pic") != FALSE:
-                return True
-        return False
+        self.assert_exists()
+        return self._has_video_stream()
 
     def check_has_video_stream(self) -> str | None:
         if not self.has_video_stream():
@@ -24,6 +24,8 @@ class TemporalMediaFile(MediaFile):
             Absolute path to a temporal media file.
         """
         super().__init__(media_file_path)
+        # duration of this file keyed on its (mtime_ns, size) fingerprint
+        self._duration_cache: dict[tuple[int, int], float] = {}
 
     def get_type(self) -> str:
         """
@@ -35,7 +37,7 @@ class TemporalMediaFile(MediaFile):
         """
         return "TemporalMediaFile"
 
-    def check_exists(self) -> str | None:
+    def _check_exists(self) -> str | None:
         """
         Checks if the file exists and is a valid temporal media file (contains audio or video stream).
 
@@ -44,12 +46,11 @@ class TemporalMediaFile(MediaFile):
         str | None
             Returns None if valid, otherwise a descriptive error message.
         """
-        msg = super().check_exists()
+        msg = super()._check_exists()
         if msg is not None:
             return msg
 
-        media_file = MediaFile(self._path)
-        if not media_file.has_audio_stream() and not media_file.has_video_stream():
+        if not self._has_audio_stream() and not self._has_video_stream():
             return (
                 f"'{self._path}' is a valid {super().get_type()} but has neither audio "
                 f"nor video stream, so it is not a valid {self.get_type()}."
@@ -57,6 +58,33 @@ class TemporalMediaFile(MediaFile):
 
         return None
 
+    @property
+    def duration(self) -> float:
+        """
+        The duration of the media in seconds, -1 if unavailable. Kept on the instance
+        until the file's modification time or size changes. Failures aren't kept, so
+        they are retried on the next access.
+        """
+        self.assert_exists()
+
+        # validation just refreshed the stat result
+        media_stat = self._stat()
+        fingerprint = (media_stat.st_mtime_ns, media_stat.st_size)
+        duration = self._duration_cache.get(fingerprint)
+        if duration is not None:
+            return duration
+
+        # the file was just validated, read the cached probe without validating again
+        duration_str = self._get_format_info("duration")
+        if duration_str is None:
+            logging.error(f"Failed to retrieve duration for media file '{self._path}'.")
+            return -1
+
+        duration = float(duration_str)
+        # only the current fingerprint is worth keeping
+        self._duration_cache = {fingerprint: duration}
+        return duration
+
     def get_duration(self) -> float:
         """
         Retrieves duration of the media in seconds.
@@ -66,14 +94,7 @@ class TemporalMediaFile(MediaFile):
         float
             Duration in seconds. Returns -1 if unavailable.
         """
-        self.assert_exists()
-
-        duration_str = self.get_format_info("duration")
-        if duration_str is None:
-            logging.error(f"Failed to retrieve duration for media file '{self._path}'.")
-            return -1
-
-        return float(duration_str)
+        return self.duration
 
     def get_bitrate(self, stream: str) -> int | None:
         """
@@ -91,7 +112,7 @@ class TemporalMediaFile(MediaFile):
         """
         self.assert_exists()
 
-        bitrate = self.get_stream_info(stream, "bit_rate")
+        bitrate = self._get_stream_info(stream, "bit_rate")
         if bitrate is None:
             logging.error(f"Could not retrieve bitrate from stream '{stream}' in '{self._path}'.")
             return None
@@ -7,22 +7,34 @@ Notes
 """
 
 # standard library imports
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 import logging
 from math import floor
+import os
 from random import randint
 import subprocess
+import tempfile
+from typing import Iterator
 
 # current package imports
 from .exceptions import VideoFileError
 from .image_file import ImageFile
 from .temporal_media_file import TemporalMediaFile
 
-# local imports
-from ai_clips_maker.utils.conversions import seconds_to_hms_time_format
+# 3rd party imports
+import numpy as np
 
 
 SUCCESS = 0
+# JPEG start and end of image markers, used to split ffmpeg's image2pipe output
+_JPEG_SOI = b"\xff\xd8"
+_JPEG_EOI = b"\xff\xd9"
+_PIPE_CHUNK_SIZE = 64 * 1024
+# VideoFile properties stored on the instance once computed
+_CACHED_VIDEO_PROPERTIES = ("frame_rate", "height_pixels", "width_pixels", "bitrate")
+# number of trailing bytes of ffmpeg's stderr reported when it fails
+_STDERR_TAIL_NUM_BYTES = 4096
 
 
 class VideoFile(TemporalMediaFile):
@@ -52,7 +64,7 @@ class VideoFile(TemporalMediaFile):
         """
         return "VideoFile"
 
-    def check_exists(self) -> str or None:
+    def _check_exists(self) -> str or None:
         """
         Checks that the VideoFile exists in the file system. Returns None if so, a
         descriptive error message if not.
@@ -63,23 +75,92 @@ class VideoFile(TemporalMediaFile):
             None if the VideoFile exists in the file system, a descriptive error
             message if not.
         """
-        msg = super().check_exists()
+        msg = super()._check_exists()
         if msg is not None:
             return msg
 
-        temporal_media_file = TemporalMediaFile(self._path)
-        if temporal_media_file.has_video_stream() is False:
+        if not self._has_video_stream():
             return (
                 f"'{self._path}' is a valid {super().get_type()} but has no video stream, "
                 f"so it is not a valid video file."
             )
-        if temporal_media_file.is_video_only() is False:
+        if self._has_audio_stream():
             return (
                 f"'{self._path}' is a valid {super().get_type()} but is not video-only. "
                 f"Use 'AudioVideoFile' for files containing both audio and video."
             )
 
-    @lru_cache(maxsize=1)
+    @classmethod
+    def probe_many(cls, video_file_paths: list[str]) -> list[dict or None]:
+        """
+        Validates and probes several video files concurrently. The ffprobe results
+        are cached, so later stream queries on these files don't spawn ffprobe again.
+
+        Parameters
+        ----------
+        video_file_paths: list[str]
+            Absolute paths to video files.
+
+        Returns
+        -------
+        list[dict or None]
+            The ffprobe streams and format information of each file, in the order of
+            'video_file_paths'.
+        """
+        if len(video_file_paths) == 0:
+            return []
+
+        def probe(video_file_path: str) -> dict or None:
+            video_file = cls(video_file_path)
+            video_file.assert_exists()
+            return video_file._probe()
+
+        # the threads only wait on their ffprobe process
+        max_workers = min(len(video_file_paths), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(probe, video_file_paths))
+
+    @cached_property
+    def frame_rate(self) -> float:
+        """
+        The frame rate of the video file. Computed once and stored on the instance.
+        """
+        frame_rate: str = self._v0_info["r_frame_rate"]
+        numerator, denominator = map(int, frame_rate.split("/"))
+        return numerator / denominator
+
+    @cached_property
+    def height_pixels(self) -> int:
+        """
+        The height in pixels of the video file. Computed once and stored on the
+        instance.
+        """
+        return int(self._v0_info["height"])
+
+    @cached_property
+    def width_pixels(self) -> int:
+        """
+        The width in pixels of the video file. Computed once and stored on the
+        instance.
+        """
+        return int(self._v0_info["width"])
+
+    @cached_property
+    def bitrate(self) -> int:
+        """
+        The bitrate in bits per second of the video file, the container's bitrate if
+        the video stream has none (e.g. in MKV and WebM files). Computed once and
+        stored on the instance.
+        """
+        bitrate = self._v0_info.get("bit_rate")
+        if bitrate is None:
+            bitrate = self._get_format_info("bit_rate")
+        if bitrate is None:
+            msg = f"Failed to retrieve the bitrate of video file '{self._path}'."
+            logging.error(msg)
+            raise VideoFileError(msg)
+        return int(bitrate)
+
     def get_frame_rate(self) -> float:
         """
         Returns the frame rate of the video file.
@@ -89,11 +170,8 @@ class VideoFile(TemporalMediaFile):
         float
             The frame rate of the video file.
         """
-        frame_rate: str = self.get_stream_info("v:0", "r_frame_rate")
-        numerator, denominator = map(int, frame_rate.split("/"))
-        return numerator / denominator
+        return self.frame_rate
 
-    @lru_cache(maxsize=1)
     def get_height_pixels(self) -> int:
         """
         Returns the height in pixels of the video file.
@@ -103,9 +181,8 @@ class VideoFile(TemporalMediaFile):
         int
             The height in pixels of the video file.
         """
-        return int(self.get_stream_info("v:0", "height"))
+        return self.height_pixels
 
-    @lru_cache(maxsize=1)
     def get_width_pixels(self) -> int:
         """
         Returns the width in pixels of the video file.
@@ -115,9 +192,8 @@ class VideoFile(TemporalMediaFile):
         int
             The width in pixels of the video file.
         """
-        return int(self.get_stream_info("v:0", "width"))
+        return self.width_pixels
 
-    @lru_cache(maxsize=1)
     def get_bitrate(self) -> int or None:
         """
         Returns the bitrate in bits per second of the video file.
@@ -127,16 +203,40 @@ class VideoFile(TemporalMediaFile):
         int
             The bitrate in bits per second of the video file.
         """
-        return int(self.get_stream_info("v:0", "bit_rate"))
+        return self.bitrate
+
+    def _invalidate_stat(self) -> None:
+        """
+        Discards the cached stat result and the cached video properties, e.g. after
+        the file was moved or deleted.
+        """
+        super()._invalidate_stat()
+        for name in _CACHED_VIDEO_PROPERTIES:
+            self.__dict__.pop(name, None)
+
+    @property
+    def _v0_info(self) -> dict:
+        """
+        The ffprobe information of the first video stream ('v:0'), read from the
+        cached ffprobe result of the file.
+        """
+        self.assert_exists()
+        for stream in self._get_streams():
+            if stream.get("codec_type") == "video":
+                return stream
+        return {}
 
     def extract_frame(
         self,
         extract_sec: float,
         dest_image_file_path: str,
         overwrite: bool = True,
+        accurate_seek: bool = True,
+        num_threads: int = None,
     ) -> ImageFile or None:
         """
-        Extracts a frame at 'extract_sec' to 'dest_image_file_path'.
+        Extracts a frame at 'extract_sec' to 'dest_image_file_path'. The image format
+        follows the extension of 'dest_image_file_path'.
 
         Parameters
         ----------
@@ -146,6 +246,11 @@ class VideoFile(TemporalMediaFile):
             The path to save the extracted frame.
         overwrite: bool
             If True, overwrites the file; otherwise, does not overwrite.
+        accurate_seek: bool
+            If False, the keyframe at or before 'extract_sec' is extracted, which
+            avoids decoding from that keyframe up to 'extract_sec'.
+        num_threads: int
+            Number of threads ffmpeg decodes with, chosen by ffmpeg if None.
 
         Returns
         -------
@@ -192,29 +297,44 @@ class VideoFile(TemporalMediaFile):
             logging.error(msg)
             raise VideoFileError(msg)
 
-        extract_hms = seconds_to_hms_time_format(extract_sec)
+        # ffmpeg takes the seek position in seconds, no need to format it as HH:MM:SS
+        seek_args = ["-ss", f"{extract_sec:.6f}"]
+        if accurate_seek is False:
+            seek_args.append("-noaccurate_seek")
+        if num_threads is not None:
+            seek_args.extend(["-threads", str(num_threads)])
+        # only the video stream is decoded, audio/subtitle/data streams are skipped
         result = subprocess.run(
             [
                 "ffmpeg",
                 "-y",
-                "-ss",
-                extract_hms,
+                "-hide_banner",
+                "-nostats",
+                "-loglevel",
+                "error",
+                *seek_args,
                 "-i",
                 self.path,
+                "-an",
+                "-sn",
+                "-dn",
                 "-frames:v",
                 "1",
                 "-q:v",
-                "0",
+                "2",
                 dest_image_file_path,
             ],
-            capture_output=True,
-            text=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
         )
 
         if result.returncode != SUCCESS:
+            # the last lines hold the error, don't decode a long log in full
+            stderr = result.stderr[-_STDERR_TAIL_NUM_BYTES:].decode("utf-8", errors="replace")
             err_msg = (
                 f"Extracting frame from video file '{self._path}' to '{dest_image_file_path}' "
-                f"was unsuccessful. Details: {result.stderr}"
+                f"was unsuccessful. Details: {stderr}"
             )
             logging.error(err_msg)
             return None
@@ -223,14 +343,272 @@ class VideoFile(TemporalMediaFile):
         image_file.assert_exists()
         return image_file
 
+    def extract_frames_batch(
+        self,
+        extract_secs: list[float],
+        write_to: list[str] = None,
+        overwrite: bool = True,
+        accurate_seek: bool = True,
+        num_threads: int = None,
+    ) -> list[bytes] or None:
+        """
+        Extracts the frames at 'extract_secs' as JPEG images using a single ffmpeg
+        process. ffmpeg seeks to the earliest requested time and selects the
+        requested frames from there, piping them to stdout.
+
+        Frames are selected by their number counted from the seek position, which
+        assumes a constant frame rate. On variable frame rate video the selected
+        frames can drift from the requested times, use extract_frame() there.
+
+        Parameters
+        ----------
+        extract_secs: list[float]
+            The times (in seconds) at which to extract frames.
+        write_to: list[str]
+            If given, the paths to save the extracted frames to (as JPEG), one per
+            entry of 'extract_secs'.
+        overwrite: bool
+            If True, overwrites the files at 'write_to'; otherwise, does not overwrite.
+        accurate_seek: bool
+            If False, ffmpeg seeks to the keyframe at or before the earliest time, so
+            all frames are taken up to one keyframe interval early. Cheaper when
+            exact timing doesn't matter, e.g. for thumbnails.
+        num_threads: int
+            Number of threads ffmpeg decodes with, chosen by ffmpeg if None.
+
+        Returns
+        -------
+        list[bytes] or None
+            The JPEG encoded frames in the order of 'extract_secs', None if
+            unsuccessful.
+
+        Raises
+        ------
+        VideoFileError: If a time is negative or exceeds the video duration, or if
+            'write_to' doesn't match 'extract_secs'.
+        """
+        self.assert_exists()
+        if len(extract_secs) == 0:
+            return []
+
+        if write_to is not None:
+            if len(write_to) != len(extract_secs):
+                msg = (
+                    f"write_to ({len(write_to)} paths) must have one path per "
+                    f"extract_secs entry ({len(extract_secs)} times)."
+                )
+                logging.error(msg)
+                raise VideoFileError(msg)
+            for dest_image_file_path in write_to:
+                if overwrite is True:
+                    self._fs_manager.assert_parent_dir_exists(
+                        ImageFile(dest_image_file_path)
+                    )
+                else:
+                    self._fs_manager.assert_valid_path_for_new_fs_object(
+                        dest_image_file_path
+                    )
+                self._fs_manager.assert_paths_not_equal(
+                    self.path,
+                    dest_image_file_path,
+                    "video_file path",
+                    "dest_image_file_path",
+                )
+
+        video_duration = self.get_duration()
+        for extract_sec in extract_secs:
+            if extract_sec < 0:
+                msg = f"extract_sec ({extract_sec} seconds) cannot be negative."
+                logging.error(msg)
+                raise VideoFileError(msg)
+            if video_duration != -1 and extract_sec > video_duration:
+                msg = (
+                    f"extract_sec ({extract_sec} seconds) cannot exceed video duration "
+                    f"({video_duration} seconds)."
+                )
+                logging.error(msg)
+                raise VideoFileError(msg)
+
+        # frame numbers are counted from the seek position, assuming a constant
+        # frame rate
+        start_sec = min(extract_secs)
+        frame_rate = self.get_frame_rate()
+        frame_nums = [round((sec - start_sec) * frame_rate) for sec in extract_secs]
+        unique_frame_nums = sorted(set(frame_nums))
+        select_expr = "+".join(f"eq(n,{frame_num})" for frame_num in unique_frame_nums)
+
+        seek_args = ["-ss", f"{start_sec:.6f}"]
+        if accurate_seek is False:
+            seek_args.append("-noaccurate_seek")
+        if num_threads is not None:
+            seek_args.extend(["-threads", str(num_threads)])
+        # stderr goes to a temporary file rather than a pipe, which could fill up and
+        # block ffmpeg while stdout is read
+        stderr_file = tempfile.TemporaryFile()
+        process = subprocess.Popen(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-nostats",
+                "-loglevel",
+                "error",
+                *seek_args,
+                "-i",
+                self.path,
+                "-an",
+                "-sn",
+                "-dn",
+                "-vf",
+                f"select='{select_expr}'",
+                "-vsync",
+                "vfr",
+                "-frames:v",
+                str(len(unique_frame_nums)),
+                "-f",
+                "image2pipe",
+                "-vcodec",
+                "mjpeg",
+                "-q:v",
+                "2",
+                "pipe:1",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+        )
+
+        # split the stream into JPEGs on their start (SOI) and end (EOI) markers.
+        # ffmpeg's JPEGs have no embedded thumbnails, so markers don't nest
+        frames = []
+        buffer = bytearray()
+        while True:
+            chunk = process.stdout.read(_PIPE_CHUNK_SIZE)
+            if not chunk:
+                break
+            buffer += chunk
+            while True:
+                start = buffer.find(_JPEG_SOI)
+                if start == -1:
+                    break
+                end = buffer.find(_JPEG_EOI, start + len(_JPEG_SOI))
+                if end == -1:
+                    break
+                end += len(_JPEG_EOI)
+                frames.append(bytes(buffer[start:end]))
+                del buffer[:end]
+        process.stdout.close()
+        returncode = process.wait()
+
+        with stderr_file:
+            if returncode != SUCCESS or len(frames) != len(unique_frame_nums):
+                # the last lines hold the error, don't decode a long log in full
+                stderr_size = stderr_file.seek(0, os.SEEK_END)
+                stderr_file.seek(max(stderr_size - _STDERR_TAIL_NUM_BYTES, 0))
+                stderr = stderr_file.read().decode("utf-8", errors="replace")
+                logging.error(
+                    f"Extracting frames at {extract_secs} seconds from video file "
+                    f"'{self._path}' was unsuccessful. Return code: {returncode}, "
+                    f"extracted {len(frames)} of {len(unique_frame_nums)} frames. "
+                    f"Details: {stderr}"
+                )
+                return None
+
+        frames_by_num = dict(zip(unique_frame_nums, frames))
+        extracted_frames = [frames_by_num[frame_num] for frame_num in frame_nums]
+
+        if write_to is not None:
+            for frame, dest_image_file_path in zip(extracted_frames, write_to):
+                with open(dest_image_file_path, "wb") as f:
+                    f.write(frame)
+
+        return extracted_frames
+
+    def pipe_frames_rgb24(
+        self,
+        fps: float,
+        width: int,
+        height: int,
+    ) -> Iterator[np.ndarray]:
+        """
+        Decodes the video at 'fps' frames per second, scaled to 'width' x 'height',
+        and yields the frames as RGB arrays. ffmpeg writes raw rgb24 pixels to a pipe
+        that is read straight into the arrays, so no image is encoded, decoded or
+        written to disk.
+
+        Parameters
+        ----------
+        fps: float
+            Frame rate to sample the video at.
+        width: int
+            Width in pixels of the yielded frames.
+        height: int
+            Height in pixels of the yielded frames.
+
+        Returns
+        -------
+        Iterator[np.ndarray]
+            Frames of shape (height, width, 3) and dtype uint8.
+        """
+        self.assert_exists()
+        process = subprocess.Popen(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-nostats",
+                "-loglevel",
+                "error",
+                "-i",
+                self.path,
+                "-an",
+                "-sn",
+                "-dn",
+                "-vf",
+                f"fps={fps},scale={width}:{height}",
+                "-f",
+                "rawvideo",
+                "-pix_fmt",
+                "rgb24",
+                "pipe:1",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+        frame_num_bytes = width * height * 3
+        try:
+            while True:
+                frame = np.empty((height, width, 3), dtype=np.uint8)
+                if process.stdout.readinto(memoryview(frame).cast("B")) != frame_num_bytes:
+                    break
+                yield frame
+        except BaseException:
+            # the caller stopped iterating (GeneratorExit) or reading failed before
+            # ffmpeg is done, it won't exit on its own
+            process.stdout.close()
+            process.kill()
+            process.wait()
+            raise
+
+        # at the end of the stream ffmpeg may still be flushing, let it exit
+        process.stdout.close()
+        returncode = process.wait()
+
+        if returncode != SUCCESS:
+            logging.error(
+                f"Piping frames from video file '{self._path}' was unsuccessful. "
+                f"Return code: {returncode}"
+            )
+
     def extract_thumbnail(
         self,
         thumbnail_file_path: str,
         overwrite: bool = True,
+        num_threads: int = None,
     ) -> ImageFile or None:
         """
-        Extracts a thumbnail (image) from a random time between 30 seconds and 2 minutes
-        into the video.
+        Extracts a thumbnail from a random time between 30 seconds and 2 minutes into
+        the video. The image format follows the extension of 'thumbnail_file_path'.
 
         Parameters
         ----------
@@ -238,6 +616,8 @@ class VideoFile(TemporalMediaFile):
             The path to save the extracted thumbnail.
         overwrite: bool
             If True, overwrites the file at thumbnail_file_path; otherwise, does not overwrite.
+        num_threads: int
+            Number of threads ffmpeg decodes with, chosen by ffmpeg if None.
 
         Returns
         -------
@@ -255,15 +635,64 @@ class VideoFile(TemporalMediaFile):
         min_time = max(min(30, floor(video_duration) - 30), 0)
         extract_sec = randint(min_time, max_time)
 
+        # ffmpeg writes the thumbnail in the format of its extension
         image_file = self.extract_frame(
             extract_sec=extract_sec,
             dest_image_file_path=thumbnail_file_path,
             overwrite=overwrite,
+            # any frame around a random time makes a thumbnail, snap to a keyframe
+            accurate_seek=False,
+            num_threads=num_threads,
         )
 
         if image_file is None:
             logging.error(f"Failed to extract thumbnail from '{self._path}' to '{thumbnail_file_path}'.")
-            return None
-
-        image_file.assert_exists()
         return image_file
+
+    @staticmethod
+    def extract_thumbnails_many(
+        video_and_thumbnail_file_paths: list[tuple["VideoFile", str]],
+        overwrite: bool = True,
+        max_workers: int = None,
+    ) -> list[ImageFile or None]:
+        """
+        Extracts thumbnails of several video files concurrently, see
+        extract_thumbnail().
+
+        Parameters
+        ----------
+        video_and_thumbnail_file_paths: list[tuple[VideoFile, str]]
+            Video files and the paths to save their thumbnails to.
+        overwrite: bool
+            If True, overwrites the files at the thumbnail paths; otherwise, does not
+            overwrite.
+        max_workers: int
+            Maximum number of ffmpeg processes running at once. Defaults to half the
+            number of CPUs.
+
+        Returns
+        -------
+        list[ImageFile or None]
+            The extracted thumbnails in the order of 'video_and_thumbnail_file_paths',
+            None for unsuccessful extractions.
+        """
+        if len(video_and_thumbnail_file_paths) == 0:
+            return []
+
+        num_cpus = os.cpu_count() or 1
+        if max_workers is None:
+            max_workers = max(1, num_cpus // 2)
+        max_workers = min(max_workers, len(video_and_thumbnail_file_paths))
+        # split the cores between the ffmpeg processes so their decoder threads don't
+        # oversubscribe the machine
+        num_threads = max(1, num_cpus // max_workers)
+
+        def extract(video_and_thumbnail_file_path: tuple["VideoFile", str]):
+            video_file, thumbnail_file_path = video_and_thumbnail_file_path
+            return video_file.extract_thumbnail(
+                thumbnail_file_path, overwrite=overwrite, num_threads=num_threads
+            )
+
+        # the threads only wait on their ffmpeg process, the work happens in ffmpeg
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(extract, video_and_thumbnail_file_paths))
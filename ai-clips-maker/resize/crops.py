@@ -72,13 +72,23 @@ class Crops:
         Crops
             A new instance with copied attributes and deep-copied segments.
         """
-        return Crops(
-            self._original_width,
-            self._original_height,
-            self._crop_width,
-            self._crop_height,
-            [segment.copy() for segment in self._segments],
-        )
+        # bypass __init__, the attributes are copied as is. A segment's times and
+        # position can be reassigned, so segments can't be shared between the copies
+        crops = object.__new__(Crops)
+        crops._original_width = self._original_width
+        crops._original_height = self._original_height
+        crops._crop_width = self._crop_width
+        crops._crop_height = self._crop_height
+        crops._segments = list(map(Segment.copy, self._segments))
+        return crops
+
+    def __copy__(self) -> "Crops":
+        """Supports copy.copy(), equivalent to copy()."""
+        return self.copy()
+
+    def __deepcopy__(self, memo: dict) -> "Crops":
+        """Supports copy.deepcopy(), equivalent to copy()."""
+        return self.copy()
 
     def to_dict(self) -> dict:
         """
@@ -129,6 +139,9 @@ class Crops:
         """
         if not isinstance(other, Crops):
             return False
+        # cheapest comparisons first, segments are only compared if everything else
+        # matches. List equality compares the lengths first and stops at the first
+        # differing segment
         return (
             self._original_width == other._original_width
             and self._original_height == other._original_height
@@ -137,6 +150,9 @@ class Crops:
             and self._segments == other._segments
         )
 
+    # Crops are mutable and compared by value, so they must not be hashed
+    __hash__ = None
+
     def __ne__(self, other: object) -> bool:
         """Returns True if not equal to other Crops instance."""
         return not self.__eq__(other)
@@ -2,12 +2,18 @@
 Image processing utilities.
 """
 
+import cv2
 import numpy as np
 
+# BT.601 luma weights for the float path of rgb_to_gray
+_LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+_LUMA_WEIGHTS.setflags(write=False)
+
 
 def rgb_to_gray(rgb_image: np.ndarray) -> np.ndarray:
     """
-    Converts an RGB image to grayscale using the standard luminosity method.
+    Converts an RGB image to grayscale using the standard luminosity method. Images
+    must be in RGB channel order, not OpenCV's default BGR.
 
     Parameters
     ----------
@@ -19,8 +25,21 @@ def rgb_to_gray(rgb_image: np.ndarray) -> np.ndarray:
     np.ndarray
         Grayscale version of the input image as a 2D NumPy array.
     """
-    weights = np.array([0.299, 0.587, 0.114])
-    return (rgb_image @ weights).astype(np.uint8)
+    if rgb_image.dtype == np.uint8 and rgb_image.ndim == 3 and rgb_image.shape[2] == 3:
+        # OpenCV's SIMD kernel uses the same BT.601 weights in fixed point
+        return cv2.cvtColor(rgb_image, cv2.COLOR_RGB2GRAY)
+
+    if rgb_image.dtype != np.uint8:
+        return (rgb_image @ _LUMA_WEIGHTS).astype(np.uint8)
+
+    # fixed-point luma weights scaled by 256 (77 + 150 + 29 = 256), so the weighted
+    # sum of uint8 channels fits in uint16 and dividing by 256 is a shift
+    gray = rgb_image[..., 0].astype(np.uint16)
+    gray *= 77
+    gray += rgb_image[..., 1].astype(np.uint16) * np.uint16(150)
+    gray += rgb_image[..., 2].astype(np.uint16) * np.uint16(29)
+    gray >>= 8
+    return gray.astype(np.uint8)
 
 
 def calc_img_bytes(height: int, width: int, channels: int) -> int:
@@ -2,6 +2,8 @@
 Geometric rectangle representation with utility operations.
 """
 
+import numpy as np
+
 
 class Rect:
     """
@@ -9,6 +11,9 @@ class Rect:
     Commonly used for cropping or defining regions of interest (ROIs).
     """
 
+    # rects are created per face and frame, slots avoid a __dict__ per instance
+    __slots__ = ("x", "y", "width", "height")
+
     def __init__(self, x: int, y: int, width: int, height: int) -> None:
         """
         Initialize a Rect object.
@@ -56,13 +61,22 @@ class Rect:
         """
         if not isinstance(other, Rect):
             return False
-        return (
-            self.x == other.x
-            and self.y == other.y
-            and self.width == other.width
-            and self.height == other.height
+        return (self.x, self.y, self.width, self.height) == (
+            other.x, other.y, other.width, other.height
         )
 
+    def __hash__(self) -> int:
+        """
+        Returns a hash consistent with __eq__, so rectangles can key dicts and sets.
+        Rects used as keys must not be modified.
+
+        Returns
+        -------
+        int
+            Hash of the rectangle's position and dimensions.
+        """
+        return hash((self.x, self.y, self.width, self.height))
+
     def __add__(self, other: "Rect") -> "Rect":
         """
         Adds two rectangles component-wise.
@@ -98,6 +112,14 @@ class Rect:
         Rect
             Scaled rectangle.
         """
+        if isinstance(factor, int):
+            # integer products are exact, nothing to truncate
+            return Rect(
+                self.x * factor,
+                self.y * factor,
+                self.width * factor,
+                self.height * factor,
+            )
         return Rect(
             x=int(self.x * factor),
             y=int(self.y * factor),
@@ -125,3 +147,78 @@ class Rect:
             width=int(self.width / factor),
             height=int(self.height / factor),
         )
+
+
+class RectArray:
+    """
+    Many rectangles stored as the rows (x, y, width, height) of a single int32
+    array, so arithmetic on all of them is one NumPy operation instead of one Rect
+    per rectangle.
+    """
+
+    def __init__(self, xywh: np.ndarray) -> None:
+        """
+        Initialize a RectArray object.
+
+        Parameters
+        ----------
+        xywh : np.ndarray
+            Array of shape (N, 4) with the x, y, width and height of each rectangle.
+        """
+        self.xywh = np.asarray(xywh, dtype=np.int32).reshape(-1, 4)
+
+    @classmethod
+    def from_rects(cls, rects: list[Rect]) -> "RectArray":
+        """
+        Creates the array from Rect objects.
+        """
+        return cls([(r.x, r.y, r.width, r.height) for r in rects])
+
+    @classmethod
+    def from_corners(cls, boxes: np.ndarray) -> "RectArray":
+        """
+        Creates the array from bounding boxes given by their corners.
+
+        Parameters
+        ----------
+        boxes : np.ndarray
+            Array of shape (N, 4) with the x1, y1, x2, y2 of each bounding box.
+        """
+        boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+        return cls(np.concatenate((boxes[:, :2], boxes[:, 2:] - boxes[:, :2]), axis=1))
+
+    def to_rects(self) -> list[Rect]:
+        """
+        Returns the rectangles as Rect objects.
+        """
+        return [Rect(x, y, width, height) for x, y, width, height in self.xywh.tolist()]
+
+    def sum(self) -> Rect:
+        """
+        Returns the component-wise sum of the rectangles, as adding them with Rect
+        would, accumulated without overflowing int32.
+        """
+        x, y, width, height = self.xywh.sum(axis=0, dtype=np.int64).tolist()
+        return Rect(x, y, width, height)
+
+    def __len__(self) -> int:
+        return len(self.xywh)
+
+    def __add__(self, other: "RectArray") -> "RectArray":
+        """
+        Adds two arrays of rectangles component-wise.
+        """
+        return RectArray(self.xywh + other.xywh)
+
+    def __mul__(self, factor: float) -> "RectArray":
+        """
+        Scales the rectangles by a factor, truncating like Rect.__mul__.
+        """
+        return RectArray(np.trunc(self.xywh * float(factor)))
+
+    def __truediv__(self, factor: float) -> "RectArray":
+        """
+        Divides the rectangles' properties by a factor, truncating like
+        Rect.__truediv__.
+        """
+        return RectArray(np.trunc(self.xywh / float(factor)))
@@ -3,6 +3,7 @@ High-level pipeline for resizing a video to a target aspect ratio (default: 9:16
 Involves speaker diarization, scene detection, and facial region analysis.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
 from .crops import Crops
@@ -72,18 +73,25 @@ def resize(
     media.assert_has_audio_stream()
     media.assert_has_video_stream()
 
-    # Step 2: Speaker diarization (who speaks when)
-    logging.debug(f"Running diarization on video: {media.get_filename()}")
-    diarizer = PyannoteDiarizer(auth_token=pyannote_auth_token, device=device)
-    diarized_segments = diarizer.diarize(
-        media,
-        min_segment_duration=min_segment_duration,
-        time_precision=time_precision,
-    )
+    # Steps 2 and 3 don't depend on each other, scene detection runs on a worker
+    # thread while the diarization runs
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Step 3: Scene change detection (detect cut points)
+        logging.debug(f"Detecting scene changes: {media.get_filename()}")
+        scene_changes_future = executor.submit(
+            detect_scenes, media, min_scene_duration=min_scene_duration
+        )
+
+        # Step 2: Speaker diarization (who speaks when)
+        logging.debug(f"Running diarization on video: {media.get_filename()}")
+        diarizer = PyannoteDiarizer(auth_token=pyannote_auth_token, device=device)
+        diarized_segments = diarizer.diarize(
+            media,
+            min_segment_duration=min_segment_duration,
+            time_precision=time_precision,
+        )
 
-    # Step 3: Scene change detection (detect cut points)
-    logging.debug(f"Detecting scene changes: {media.get_filename()}")
-    scene_changes = detect_scenes(media, min_duration=min_scene_duration)
+        scene_changes = scene_changes_future.result()
 
     # Step 4: Resize video using speaker + scene + face info
     logging.debug(f"Resizing video: {media.get_filename()}")
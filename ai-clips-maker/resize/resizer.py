@@ -12,7 +12,7 @@ import logging
 from .crops import Crops
 from .exceptions import ResizerError
 from .img_proc import calc_img_bytes
-from .rect import Rect
+from .rect import Rect, RectArray
 from .segment import Segment
 from .vid_proc import extract_frames
 
@@ -30,6 +30,10 @@ import numpy as np
 from sklearn.cluster import KMeans
 import torch
 
+# neighbouring segments whose crops differ by less than this fraction of the video's
+# width and height are merged
+_MAX_POSITION_DIFFERENCE_RATIO = 0.04
+
 
 class Resizer:
     """
@@ -219,20 +223,23 @@ class Resizer:
             The number of pixels along the width and height to resize the video to
         """
         resize_ar_width, resize_ar_height = resize_aspect_ratio
-        desired_aspect_ratio = resize_ar_width / resize_ar_height
-        original_aspect_ratio = original_width_pixels / original_height_pixels
+
+        # the aspect ratios are compared and applied in integer arithmetic, which is
+        # exact where float division can round across a pixel boundary
+        original_width_scaled = original_width_pixels * resize_ar_height
+        original_height_scaled = original_height_pixels * resize_ar_width
 
         # original aspect ratio is wider than desired aspect ratio
-        if original_aspect_ratio > desired_aspect_ratio:
+        if original_width_scaled > original_height_scaled:
             resize_height_pixels = original_height_pixels
-            resize_width_pixels = int(
-                resize_height_pixels * resize_ar_width / resize_ar_height
+            resize_width_pixels = (
+                resize_height_pixels * resize_ar_width // resize_ar_height
             )
         # original aspect ratio is taller than desired aspect ratio
         else:
             resize_width_pixels = original_width_pixels
-            resize_height_pixels = int(
-                resize_width_pixels * resize_ar_height / resize_ar_width
+            resize_height_pixels = (
+                resize_width_pixels * resize_ar_height // resize_ar_width
             )
 
         return resize_width_pixels, resize_height_pixels
@@ -273,18 +280,29 @@ class Resizer:
             end_time: float
                 end time of the segment in seconds
         """
+        # the merged segments are built in one pass. 'merged' holds the segments up
+        # to the current one plus at most one looked-ahead segment, so inserting a
+        # new segment after the current one doesn't copy the whole list
+        merged = speaker_segments[:1]
+        next_input_idx = 1
         segments_idx = 0
         for scene_change_sec in scene_changes:
-            segment = speaker_segments[segments_idx]
+            segment = merged[segments_idx]
             while scene_change_sec > (segment["end_time"]):
                 segments_idx += 1
-                segment = speaker_segments[segments_idx]
+                if segments_idx == len(merged):
+                    merged.append(speaker_segments[next_input_idx])
+                    next_input_idx += 1
+                segment = merged[segments_idx]
             # scene change is close to speaker segment end -> merge the two
             if 0 < (segment["end_time"] - scene_change_sec) < scene_merge_threshold:
                 segment["end_time"] = scene_change_sec
-                if segments_idx == len(speaker_segments) - 1:
-                    continue
-                next_segment = speaker_segments[segments_idx + 1]
+                if segments_idx == len(merged) - 1:
+                    if next_input_idx == len(speaker_segments):
+                        continue
+                    merged.append(speaker_segments[next_input_idx])
+                    next_input_idx += 1
+                next_segment = merged[segments_idx + 1]
                 next_segment["start_time"] = scene_change_sec
                 continue
             # scene change is close to speaker segment start -> merge the two
@@ -292,7 +310,7 @@ class Resizer:
                 segment["start_time"] = scene_change_sec
                 if segments_idx == 0:
                     continue
-                prev_segment = speaker_segments[segments_idx - 1]
+                prev_segment = merged[segments_idx - 1]
                 prev_segment["end_time"] = scene_change_sec
                 continue
             # scene change already exists
@@ -305,13 +323,10 @@ class Resizer:
                 "end_time": segment["end_time"],
             }
             segment["end_time"] = scene_change_sec
-            speaker_segments = (
-                speaker_segments[: segments_idx + 1]
-                + [new_segment]
-                + speaker_segments[segments_idx + 1 :]
-            )
+            merged.insert(segments_idx + 1, new_segment)
 
-        return speaker_segments
+        merged.extend(speaker_segments[next_input_idx:])
+        return merged
 
     def _find_first_sec_with_face_for_each_segment(
         self,
@@ -361,6 +376,10 @@ class Resizer:
             segment["found_face"] = False
             segment["is_analyzed"] = False
 
+        # only whether a frame has a face is needed here, so frames are extracted at
+        # the face detection size instead of being decoded at full size and resized
+        downsample_factor = max(video_file.get_width_pixels() / face_detect_width, 1)
+
         batch_period = 1  # interval length to sample each segment at each iteration
         sample_period = 1  # interval between consecutive samples
         analyzed_segments = 0
@@ -395,6 +414,7 @@ class Resizer:
                             (i + 1) * frames_per_batch, len(detect_secs)
                         )
                     ],
+                    downsample_factor=downsample_factor,
                 )
                 face_detections += self._detect_faces(frames, face_detect_width)
 
@@ -542,19 +562,22 @@ class Resizer:
         logging.debug("Detecting faces in {} frames.".format(len(frames)))
         downsample_factor = max(frames[0].shape[1] / face_detect_width, 1)
         detect_height = int(frames[0].shape[0] / downsample_factor)
-        resized_frames = []
-        for frame in frames:
-            resized_frame = cv2.resize(frame, (face_detect_width, detect_height))
-            if torch.cuda.is_available():
-                resized_frame = torch.from_numpy(resized_frame).to(
-                    device="cuda", dtype=torch.uint8
-                )
-            resized_frames.append(resized_frame)
-
-        # detect faces in batches
+        # frames already at the detection size are used as they are. The frames are
+        # stacked on the host so they're copied to the GPU in one transfer
+        resized_frames = np.stack([
+            frame
+            if frame.shape[:2] == (detect_height, face_detect_width)
+            else cv2.resize(frame, (face_detect_width, detect_height))
+            for frame in frames
+        ])
         if torch.cuda.is_available():
-            resized_frames = torch.stack(resized_frames)
-        detections, _ = self._face_detector.detect(resized_frames)
+            resized_frames = torch.from_numpy(resized_frames).to(
+                device="cuda", dtype=torch.uint8
+            )
+
+        # detect faces of all frames in one batch
+        with torch.no_grad():
+            detections, _ = self._face_detector.detect(resized_frames)
 
         # detections are returned as numpy arrays regardless
         face_detections = []
@@ -875,17 +898,18 @@ class Resizer:
         float
             The mouth movement of the faces across the frames.
         """
-        mouth_movement = 0
-        roi = Rect(0, 0, 0, 0)
         prev_mar = None
         mouth_movement = 0
 
+        # the roi is the average of all bounding boxes
+        rois = RectArray.from_corners(
+            np.stack([data["bounding_box"] for data in bounding_box_group])
+        )
+        roi = rois.sum() / len(rois)
+
         for bounding_box_data in bounding_box_group:
-            # roi
             box = bounding_box_data["bounding_box"]
             x1, y1, x2, y2 = box[0], box[1], box[2], box[3]
-            # sum all roi's, average after loop
-            roi += Rect(x1, y1, x2 - x1, y2 - y1)
             frame = frames[bounding_box_data["frame"]]
             face = frame[y1:y2, x1:x2, :]
 
@@ -899,7 +923,7 @@ class Resizer:
             mouth_movement += abs(mar - prev_mar)
             prev_mar = mar
 
-        return mouth_movement, roi / len(bounding_box_group)
+        return mouth_movement, roi
 
     def _calc_mouth_aspect_ratio(self, face: np.ndarray) -> float:
         """
@@ -993,36 +1017,43 @@ class Resizer:
         list[dict]
             The merged segments.
         """
-        idx = 0
-        max_position_difference_ratio = 0.04
-        video_width = video_file.get_width_pixels()
-        video_height = video_file.get_height_pixels()
-
-        for _ in range(len(segments) - 1):
-            cur_x = segments[idx]["x"]
-            next_x = segments[idx + 1]["x"]
+        # the tolerances in pixels are computed once rather than dividing each
+        # difference by the video's dimensions
+        max_x_diff = _MAX_POSITION_DIFFERENCE_RATIO * video_file.get_width_pixels()
+        max_y_diff = _MAX_POSITION_DIFFERENCE_RATIO * video_file.get_height_pixels()
+        if not segments:
+            return segments
+
+        # one pass over the segments. Each segment is compared with the last merged
+        # one, whose position is averaged with it, so positions drift along a run
+        # of segments as they did when merging in place
+        merged = [segments[0]]
+        segment = segments[0]
+        for next_segment in segments[1:]:
+            cur_x = segment["x"]
+            next_x = next_segment["x"]
             x_diff = abs(cur_x - next_x)
-            if (x_diff / video_width) < max_position_difference_ratio:
+            if x_diff < max_x_diff:
                 same_x = True
-                segments[idx]["x"] = int((cur_x + next_x) // 2)
+                segment["x"] = int((cur_x + next_x) // 2)
             else:
                 same_x = False
 
-            curr_y = segments[idx]["y"]
-            next_y = segments[idx + 1]["y"]
+            curr_y = segment["y"]
+            next_y = next_segment["y"]
             y_diff = abs(curr_y - next_y)
-            if (y_diff / video_height) < max_position_difference_ratio:
+            if y_diff < max_y_diff:
                 same_y = True
-                segments[idx]["y"] = int((curr_y + next_y) // 2)
+                segment["y"] = int((curr_y + next_y) // 2)
             else:
                 same_y = False
 
             if same_x and same_y:
-                segments[idx]["end_time"] = segments[idx + 1]["end_time"]
-                segments = segments[: idx + 1] + segments[idx + 2 :]
+                segment["end_time"] = next_segment["end_time"]
             else:
-                idx += 1
-        return segments
+                merged.append(next_segment)
+                segment = next_segment
+        return merged
 
     def cleanup(self) -> None:
         """
@@ -10,8 +10,9 @@ class Segment:
 
     Attributes
     ----------
-    speakers : list[int]
-        List of speaker IDs associated with the segment.
+    speakers : tuple[int, ...]
+        Speaker IDs associated with the segment. Stored as a tuple, so copies of the
+        segment share it.
     start_time : float
         Start time of the segment in seconds.
     end_time : float
@@ -22,48 +23,28 @@ class Segment:
         Y-coordinate of the top-left corner of the crop area.
     """
 
+    # segments are compared and read in loops over all segments of a video, plain
+    # slot attributes avoid a property call per access
+    __slots__ = ("speakers", "start_time", "end_time", "x", "y")
+
     def __init__(
         self,
-        speakers: list[int],
+        speakers: list[int] | tuple[int, ...],
         start_time: float,
         end_time: float,
         x: int,
         y: int,
     ) -> None:
-        self._speakers = speakers
-        self._start_time = start_time
-        self._end_time = end_time
-        self._x = x
-        self._y = y
-
-    @property
-    def speakers(self) -> list[int]:
-        """Returns the list of speaker IDs in this segment."""
-        return self._speakers
-
-    @property
-    def start_time(self) -> float:
-        """Returns the segment's start time in seconds."""
-        return self._start_time
-
-    @property
-    def end_time(self) -> float:
-        """Returns the segment's end time in seconds."""
-        return self._end_time
-
-    @property
-    def x(self) -> int:
-        """Returns the x-coordinate of the crop region."""
-        return self._x
-
-    @property
-    def y(self) -> int:
-        """Returns the y-coordinate of the crop region."""
-        return self._y
+        self.speakers = tuple(speakers)
+        self.start_time = start_time
+        self.end_time = end_time
+        self.x = x
+        self.y = y
 
     def copy(self) -> "Segment":
         """
-        Returns a deep copy of the current Segment instance.
+        Returns a copy of the current Segment instance. The speaker IDs are
+        immutable, so the copy shares them.
 
         Returns
         -------
@@ -71,11 +52,11 @@ class Segment:
             New instance with duplicated attributes.
         """
         return Segment(
-            speakers=self._speakers.copy(),
-            start_time=self._start_time,
-            end_time=self._end_time,
-            x=self._x,
-            y=self._y,
+            speakers=self.speakers,
+            start_time=self.start_time,
+            end_time=self.end_time,
+            x=self.x,
+            y=self.y,
         )
 
     def to_dict(self) -> dict:
@@ -88,19 +69,19 @@ class Segment:
             Dictionary representation of the segment.
         """
         return {
-            "speakers": self._speakers,
-            "start_time": self._start_time,
-            "end_time": self._end_time,
-            "x": self._x,
-            "y": self._y,
+            "speakers": list(self.speakers),
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "x": self.x,
+            "y": self.y,
         }
 
     def __str__(self) -> str:
         """Returns a readable string representation."""
         return (
-            f"Segment(speakers={self._speakers}, "
-            f"start={self._start_time}, end={self._end_time}, "
-            f"position=({self._x}, {self._y}))"
+            f"Segment(speakers={list(self.speakers)}, "
+            f"start={self.start_time}, end={self.end_time}, "
+            f"position=({self.x}, {self.y}))"
         )
 
     def __repr__(self) -> str:
@@ -112,12 +93,15 @@ class Segment:
         if not isinstance(other, Segment):
             return False
         return (
-            self._speakers == other.speakers and
-            self._start_time == other.start_time and
-            self._end_time == other.end_time and
-            self._x == other.x and
-            self._y == other.y
-        )
+            self.speakers, self.start_time, self.end_time, self.x, self.y
+        ) == (other.speakers, other.start_time, other.end_time, other.x, other.y)
+
+    def __hash__(self) -> int:
+        """
+        Returns a hash consistent with __eq__, so identical segments can be
+        deduplicated with sets. Segments used as keys must not be modified.
+        """
+        return hash((self.speakers, self.start_time, self.end_time, self.x, self.y))
 
     def __ne__(self, other: object) -> bool:
         """Returns whether this segment is not equal to another."""
@@ -130,9 +114,9 @@ class Segment:
         - Has non-zero spatial and temporal bounds
         """
         return (
-            bool(self._speakers) and
-            self._start_time is not None and
-            self._end_time is not None and
-            self._x is not None and
-            self._y is not None
+            bool(self.speakers) and
+            self.start_time is not None and
+            self.end_time is not None and
+            self.x is not None and
+            self.y is not None
         )
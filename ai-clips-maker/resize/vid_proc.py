@@ -3,19 +3,36 @@ Video processing utilities: frame extraction and scene detection.
 """
 
 # Standard library
-from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_right
+from functools import lru_cache
 import logging
+import os
 
 # Internal imports
 from .exceptions import VideoProcessingError
-from .img_proc import rgb_to_gray
 from ai_clips_maker.media.video_file import VideoFile
 
 # Third-party libraries
 import av
-import cv2
+from av.video.reformatter import VideoReformatter
 import numpy as np
-from scenedetect import detect, AdaptiveDetector
+from scenedetect import AdaptiveDetector, SceneManager, open_video
+
+
+@lru_cache(maxsize=64)
+def _keyframe_pts(path: str, mtime_ns: int, size: int) -> tuple[int, ...]:
+    """
+    Returns the sorted presentation timestamps of the keyframes of the first video
+    stream at 'path'. Only packets are read, nothing is decoded. The modification
+    time and size are part of the cache key so that a changed file is indexed again.
+    """
+    with av.open(path) as container:
+        stream = container.streams.video[0]
+        return tuple(sorted(
+            packet.pts
+            for packet in container.demux(stream)
+            if packet.is_keyframe and packet.pts is not None
+        ))
 
 
 def extract_frames(
@@ -44,40 +61,68 @@ def extract_frames(
         List of extracted frames as NumPy arrays.
     """
     duration = video_file.get_duration()
-    for sec in extract_secs:
-        if sec > duration:
-            msg = f"Requested frame at {sec}s exceeds video duration {duration}s"
-            logging.error(msg)
-            raise VideoProcessingError(msg)
-
-    container = av.open(video_file.path)
-    stream = container.streams.video[0]
-    target_pts = [int(sec / stream.time_base) for sec in extract_secs]
-
-    frames = []
-    for pts in target_pts:
-        container.seek(pts, stream=stream)
-        prev_frame = None
-        for frame in container.decode(stream):
-            if frame.pts > pts:
-                frames.append(prev_frame or frame)
-                break
-            prev_frame = frame
-
-    assert len(frames) == len(extract_secs)
-
-    def process(frame):
-        img = np.array(frame.to_image())
-        if downsample_factor != 1.0:
-            h = int(img.shape[0] / downsample_factor)
-            w = int(img.shape[1] / downsample_factor)
-            img = cv2.resize(img, (w, h))
-        if grayscale:
-            img = rgb_to_gray(img).reshape(img.shape[0], img.shape[1])
-        return img
-
-    with ThreadPoolExecutor() as executor:
-        return list(executor.map(process, frames))
+    extract_secs = np.asarray(extract_secs, dtype=np.float64)
+    exceeds = extract_secs > duration
+    if exceeds.any():
+        sec = extract_secs[exceeds][0]
+        msg = f"Requested frame at {sec}s exceeds video duration {duration}s"
+        logging.error(msg)
+        raise VideoProcessingError(msg)
+
+    video_stat = os.stat(video_file.path)
+    keyframes = _keyframe_pts(
+        video_file.path, video_stat.st_mtime_ns, video_stat.st_size
+    )
+
+    frames = [None] * len(extract_secs)
+    with av.open(video_file.path) as container:
+        stream = container.streams.video[0]
+        # decode with frame threads, frames are still returned in order
+        stream.thread_type = "AUTO"
+        # timestamps in stream time base units, truncated like int()
+        target_pts = np.trunc(extract_secs / float(stream.time_base)).astype(np.int64)
+        target_pts = target_pts.tolist()
+
+        # visit the timestamps in order. A seek restarts decoding at the keyframe
+        # before the timestamp, so it's only done when that keyframe lies past the
+        # decoder's position, otherwise decoding on reaches the timestamp sooner
+        decoded = None
+        prev_frame = None  # last decoded frame at or before the timestamp
+        frame = None  # first decoded frame after the previous timestamp
+        for idx in np.argsort(extract_secs, kind="stable").tolist():
+            pts = target_pts[idx]
+            keyframe_idx = bisect_right(keyframes, pts) - 1
+            if (
+                decoded is None
+                or frame is None
+                or (keyframe_idx >= 0 and keyframes[keyframe_idx] > frame.pts)
+            ):
+                container.seek(pts, stream=stream)
+                decoded = container.decode(stream)
+                prev_frame = None
+                frame = next(decoded, None)
+            while frame is not None and frame.pts <= pts:
+                prev_frame = frame
+                frame = next(decoded, None)
+            frames[idx] = prev_frame or frame
+
+    if not frames:
+        return []
+
+    # scale and convert each frame in one libswscale pass, the reformatter reuses
+    # its scaling context since all frames share the same size and format
+    width = int(frames[0].width / downsample_factor)
+    height = int(frames[0].height / downsample_factor)
+    reformatter = VideoReformatter()
+    return [
+        reformatter.reformat(
+            frame,
+            width=width,
+            height=height,
+            format="gray8" if grayscale else "rgb24",
+        ).to_ndarray()
+        for frame in frames
+    ]
 
 
 def detect_scenes(video_file: VideoFile, min_scene_duration: float = 0.25) -> list[float]:
@@ -97,10 +142,22 @@ def detect_scenes(video_file: VideoFile, min_scene_duration: float = 0.25) -> li
         List of timestamps (in seconds) where scene changes occur.
     """
     min_len_frames = int(min_scene_duration * video_file.get_frame_rate())
-    detector = AdaptiveDetector(min_scene_len=min_len_frames)
-    scene_list = detect(video_file.path, detector)
-
-    return [
-        round(scene[1].get_seconds(), 6)
-        for scene in scene_list[:-1]  # exclude last scene end (EOF)
-    ]
+    scene_manager = SceneManager()
+    scene_manager.add_detector(AdaptiveDetector(min_scene_len=min_len_frames))
+    # the frames are downscaled by a factor picked from the video's width before the
+    # detector sees them
+    scene_manager.auto_downscale = True
+
+    # decode with PyAV, which the pyav backend runs with frame threads, rather than
+    # through OpenCV
+    video = open_video(video_file.path, backend="pyav")
+    scene_manager.detect_scenes(video=video, show_progress=False)
+    scene_list = scene_manager.get_scene_list()
+
+    # exclude last scene end (EOF)
+    scene_ends = np.fromiter(
+        (scene[1].get_seconds() for scene in scene_list[:-1]),
+        dtype=np.float64,
+        count=max(len(scene_list) - 1, 0),
+    )
+    return np.round(scene_ends, 6).tolist()
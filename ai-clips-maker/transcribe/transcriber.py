@@ -8,6 +8,7 @@ Key Features:
 - WhisperX: https://github.com/m-bain/whisperX
 """
 
+from collections import OrderedDict
 import logging
 from datetime import datetime
 
@@ -22,8 +23,19 @@ from ai_clips_maker.utils.type_checker import TypeChecker
 from ai_clips_maker.utils.utils import find_missing_dict_keys
 
 # External libraries
-import torch
-import whisperx
+import numpy as np
+
+# values accepted by WhisperTranscriberConfig, in display order
+MODEL_SIZES = ("tiny", "base", "small", "medium", "large-v1", "large-v2")
+LANGUAGES = ("en", "fr", "de", "es", "it", "ja", "zh", "nl", "uk", "pt")
+PRECISIONS = ("float32", "float16", "bfloat16", "int8", "int8_float16")
+# precisions that need a CUDA device
+CUDA_PRECISIONS = frozenset({"bfloat16", "int8_float16"})
+# number of alignment models kept loaded, one per language
+ALIGN_MODEL_CACHE_SIZE = 3
+_VALID_MODEL_SIZES = frozenset(MODEL_SIZES)
+_VALID_LANGUAGES = frozenset(LANGUAGES)
+_VALID_PRECISIONS = frozenset(PRECISIONS)
 
 
 class WhisperTranscriber:
@@ -32,16 +44,35 @@ class WhisperTranscriber:
     """
 
     def __init__(self, model_size=None, device=None, precision=None) -> None:
+        # torch is imported where it's used, importing it takes seconds
+        import torch
+
         self._config = WhisperTranscriberConfig()
         self._type_checker = TypeChecker()
 
         self._device = device or get_compute_device()
-        self._precision = precision or ("float16" if torch.cuda.is_available() else "int8")
+        # int8 weights with float16 activations halve the weight bandwidth of the
+        # decoder on GPUs compared to float16
+        self._precision = precision or (
+            "int8_float16" if self._device.startswith("cuda") else "int8"
+        )
         self._model_size = model_size or ("large-v2" if torch.cuda.is_available() else "tiny")
 
         assert_valid_torch_device(self._device)
         self._config.assert_valid_model_size(self._model_size)
         self._config.assert_valid_precision(self._precision)
+        if self._precision in CUDA_PRECISIONS and not self._device.startswith("cuda"):
+            msg = f"Precision '{self._precision}' requires a CUDA device, got '{self._device}'."
+            logging.error(msg)
+            raise TranscriberConfigError(msg)
+
+        # alignment models by language code, least recently used first
+        self._align_models: OrderedDict[str, tuple] = OrderedDict()
+
+        # whisperx is imported on first use, importing it is slow and only the
+        # transcriber needs it
+        import whisperx
+        self._whisperx = whisperx
 
         self._model = whisperx.load_model(
             whisper_arch=self._model_size,
@@ -67,11 +98,8 @@ class WhisperTranscriber:
         )
 
         # Step 2: Align characters/words
-        align_model, meta = whisperx.load_align_model(
-            language_code=raw_transcription["language"],
-            device=self._device
-        )
-        aligned = whisperx.align(
+        align_model, meta = self._get_align_model(raw_transcription["language"])
+        aligned = self._whisperx.align(
             raw_transcription["segments"],
             align_model,
             meta,
@@ -84,22 +112,38 @@ class WhisperTranscriber:
             raise NoSpeechError(f"No speech detected in: {media.path}")
 
         # Step 3: Parse character-level data
-        char_info = []
-
         try:
             del aligned["segments"][0]["chars"][0]  # Remove leading space char
         except Exception as e:
             logging.error(f"Failed to clean first char: {str(e)}")
             raise
 
-        for segment in aligned["segments"]:
-            for char in segment["chars"]:
-                char_info.append({
-                    "char": char["char"],
-                    "start_time": float(char["start"]) if "start" in char else None,
-                    "end_time": float(char["end"]) if "end" in char else None,
-                    "speaker": None
-                })
+        # transcripts have many characters, so the timestamps are converted to floats
+        # in bulk by numpy instead of one float() call per character
+        chars = [char for segment in aligned["segments"] for char in segment["chars"]]
+        start_times = _to_optional_floats(
+            np.fromiter(
+                (char.get("start", np.nan) for char in chars),
+                dtype=np.float64,
+                count=len(chars),
+            )
+        )
+        end_times = _to_optional_floats(
+            np.fromiter(
+                (char.get("end", np.nan) for char in chars),
+                dtype=np.float64,
+                count=len(chars),
+            )
+        )
+        char_info = [
+            {
+                "char": char["char"],
+                "start_time": start_time,
+                "end_time": end_time,
+                "speaker": None
+            }
+            for char, start_time, end_time in zip(chars, start_times, end_times)
+        ]
 
         return Transcription({
             "source_software": "whisperx-v3",
@@ -109,6 +153,29 @@ class WhisperTranscriber:
             "char_info": char_info,
         })
 
+    def _get_align_model(self, language_code: str) -> tuple:
+        """
+        Returns the WhisperX alignment model and its metadata for 'language_code'.
+        Loading the model dominates the transcription time of short clips, so the
+        models of the most recently used languages are kept loaded.
+        """
+        if language_code in self._align_models:
+            self._align_models.move_to_end(language_code)
+            return self._align_models[language_code]
+
+        self._align_models[language_code] = self._whisperx.load_align_model(
+            language_code=language_code,
+            device=self._device
+        )
+        if len(self._align_models) > ALIGN_MODEL_CACHE_SIZE:
+            # drop the least recently used model and release its GPU memory
+            self._align_models.popitem(last=False)
+            import torch
+
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        return self._align_models[language_code]
+
     def detect_language(self, media_file: AudioFile) -> str:
         """
         Detects the spoken language in the media file.
@@ -116,10 +183,20 @@ class WhisperTranscriber:
         self._type_checker.assert_type(media_file, "media_file", AudioFile)
         media_file.assert_exists()
         media_file.assert_has_audio_stream()
-        audio = whisperx.load_audio(media_file.path)
+        audio = self._whisperx.load_audio(media_file.path)
         return self._model.detect_language(audio)
 
 
+def _to_optional_floats(times: np.ndarray) -> list[float | None]:
+    """
+    Converts an array of times to a list of Python floats, with None where the time
+    is missing (NaN).
+    """
+    optional_times = times.astype(object)
+    optional_times[np.isnan(times)] = None
+    return optional_times.tolist()
+
+
 class WhisperTranscriberConfig(ConfigManager):
     """
     Configuration validator for WhisperTranscriber.
@@ -145,26 +222,26 @@ class WhisperTranscriberConfig(ConfigManager):
         return None
 
     def get_valid_model_sizes(self) -> list[str]:
-        return ["tiny", "base", "small", "medium", "large-v1", "large-v2"]
+        return list(MODEL_SIZES)
 
     def get_valid_languages(self) -> list[str]:
-        return ["en", "fr", "de", "es", "it", "ja", "zh", "nl", "uk", "pt"]
+        return list(LANGUAGES)
 
     def get_valid_precisions(self) -> list[str]:
-        return ["float32", "float16", "int8"]
+        return list(PRECISIONS)
 
     def check_valid_model_size(self, size: str) -> str | None:
-        if size not in self.get_valid_model_sizes():
+        if size not in _VALID_MODEL_SIZES:
             return f"Invalid model size '{size}'. Valid options: {self.get_valid_model_sizes()}"
         return None
 
     def check_valid_language(self, code: str) -> str | None:
-        if code not in self.get_valid_languages():
+        if code not in _VALID_LANGUAGES:
             return f"Invalid language code '{code}'. Valid options: {self.get_valid_languages()}"
         return None
 
     def check_valid_precision(self, precision: str) -> str | None:
-        if precision not in self.get_valid_precisions():
+        if precision not in _VALID_PRECISIONS:
             return f"Invalid precision '{precision}'. Valid: {self.get_valid_precisions()}"
         return None
 
@@ -10,7 +10,9 @@ Notes
 
 from __future__ import annotations
 from datetime import datetime
+from functools import cached_property, lru_cache
 import logging
+from operator import itemgetter
 
 # Project-specific imports
 from .exceptions import TranscriptionError
@@ -20,10 +22,73 @@ from ai_clips_maker.filesys.manager import FileSystemManager
 from ai_clips_maker.utils.type_checker import TypeChecker
 
 # External dependencies
-import nltk
-from nltk.tokenize import sent_tokenize
+import numpy as np
 
-nltk.download("punkt")
+# the checkers are stateless, so all Transcriptions share one of each
+_FS_MANAGER = FileSystemManager()
+_TYPE_CHECKER = TypeChecker()
+
+# cached_property names of the Transcription, rebuilt when new data is loaded
+_CACHED_ELEMENT_PROPERTIES = ("characters", "words", "sentences")
+
+
+@lru_cache(maxsize=1)
+def _load_sentence_tokenizer():
+    """
+    Returns NLTK's sent_tokenize. NLTK is imported and its punkt models are
+    checked on first use rather than when the module is imported, since importing
+    a transcription doesn't always tokenize sentences.
+    """
+    import nltk
+    from nltk.tokenize import sent_tokenize
+
+    # download the sentence tokenizer models only if they aren't installed yet, the
+    # check is a local lookup while a download goes through the network
+    try:
+        nltk.data.find("tokenizers/punkt")
+    except LookupError:
+        nltk.download("punkt", quiet=True)
+    return sent_tokenize
+
+
+def _time_array(items: list[dict], key: str) -> np.ndarray:
+    """
+    Returns the 'key' times of the transcription elements 'items' as a sorted
+    float64 array to search. Missing times (e.g. of digits WhisperX doesn't align)
+    take the time of the previous element, or 0 before the first timed element.
+    """
+    times = np.fromiter(
+        (np.nan if item[key] is None else item[key] for item in items),
+        dtype=np.float64,
+        count=len(items),
+    )
+    missing = np.isnan(times)
+    if missing.any():
+        # index of the last timed element at or before each element
+        last_timed = np.where(missing, 0, np.arange(len(times)))
+        np.maximum.accumulate(last_timed, out=last_timed)
+        times = times[last_timed]
+        times[np.isnan(times)] = 0.0
+    return times
+
+
+def _range_search(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    start: float,
+    end: float,
+) -> tuple[int, int]:
+    """
+    Returns the indices of the first and last elements overlapping the time range
+    [start, end], with the same rules as Transcription._binary_search(). Both
+    bounds are searched in one np.searchsorted call.
+    """
+    indices = np.searchsorted(starts, (start, end), side="right") - 1
+    start_idx, end_idx = int(indices[0]), int(indices[1])
+    if end_idx < 0 or end > ends[end_idx]:
+        # the end falls between two elements
+        end_idx += 1
+    return start_idx, end_idx
 
 
 class Transcription:
@@ -33,9 +98,11 @@ class Transcription:
     """
 
     def __init__(self, raw_transcription: dict | JSONFile) -> None:
-        self._fs = FileSystemManager()
-        self._type_checker = TypeChecker()
-        self._type_checker.assert_type(raw_transcription, "transcription", (dict, JSONFile))
+        # the TypeChecker only builds the error of an invalid transcription
+        if not isinstance(raw_transcription, (dict, JSONFile)):
+            _TYPE_CHECKER.assert_type(
+                raw_transcription, "transcription", (dict, JSONFile)
+            )
 
         self._source = None
         self._created = None
@@ -45,6 +112,15 @@ class Transcription:
         self._text = None
         self._words = None
         self._sentences = None
+        # start and end times of the characters, words and sentences as parallel
+        # arrays, searched with np.searchsorted (bisection in C)
+        self._char_starts = None
+        self._char_ends = None
+        self._word_starts = None
+        self._word_ends = None
+        self._sentence_starts = None
+        self._sentence_ends = None
+        self._end_time = None
 
         if isinstance(raw_transcription, JSONFile):
             self._load_from_json(raw_transcription)
@@ -69,18 +145,17 @@ class Transcription:
 
     @property
     def end_time(self) -> float:
-        for ch in reversed(self._chars):
-            if ch["end_time"] is not None:
-                return ch["end_time"]
-            if ch["start_time"] is not None:
-                return ch["start_time"]
+        return self._end_time
 
     @property
     def text(self) -> str:
         return self._text
 
-    @property
+    @cached_property
     def characters(self) -> list[Character]:
+        """
+        The characters of the transcription. Built once and stored on the instance.
+        """
         return [
             Character(
                 start_time=ci["start_time"],
@@ -91,8 +166,11 @@ class Transcription:
             ) for ci in self._chars
         ]
 
-    @property
+    @cached_property
     def words(self) -> list[Word]:
+        """
+        The words of the transcription. Built once and stored on the instance.
+        """
         return [
             Word(
                 start_time=wi["start_time"],
@@ -103,8 +181,11 @@ class Transcription:
             ) for wi in self._words
         ]
 
-    @property
+    @cached_property
     def sentences(self) -> list[Sentence]:
+        """
+        The sentences of the transcription. Built once and stored on the instance.
+        """
         return [
             Sentence(
                 start_time=si["start_time"],
@@ -116,20 +197,26 @@ class Transcription:
 
     def get_char_info(self, start: float = None, end: float = None) -> list:
         self._validate_time_range(start, end)
-        return self._slice_info(self._chars, start, end, self.find_char_index)
+        return self._slice_info(
+            self._chars, self._char_starts, self._char_ends, start, end
+        )
 
     def get_word_info(self, start: float = None, end: float = None) -> list:
         self._validate_time_range(start, end)
-        return self._slice_info(self._words, start, end, self.find_word_index)
+        return self._slice_info(
+            self._words, self._word_starts, self._word_ends, start, end
+        )
 
     def get_sentence_info(self, start: float = None, end: float = None) -> list:
         self._validate_time_range(start, end)
-        return self._slice_info(self._sentences, start, end, self.find_sentence_index)
+        return self._slice_info(
+            self._sentences, self._sentence_starts, self._sentence_ends, start, end
+        )
 
     def store_as_json_file(self, file_path: str) -> JSONFile:
         json_file = JSONFile(file_path)
         json_file.assert_has_file_extension("json")
-        self._fs.assert_parent_dir_exists(json_file)
+        _FS_MANAGER.assert_parent_dir_exists(json_file)
         json_file.delete()
 
         serialized_chars = [
@@ -148,16 +235,19 @@ class Transcription:
         return json_file
 
     def find_char_index(self, target: float, mode: str) -> int:
-        return self._binary_search(self._chars, target, mode)
+        return self._binary_search(self._char_starts, self._char_ends, target, mode)
 
     def find_word_index(self, target: float, mode: str) -> int:
-        return self._binary_search(self._words, target, mode)
+        return self._binary_search(self._word_starts, self._word_ends, target, mode)
 
     def find_sentence_index(self, target: float, mode: str) -> int:
-        return self._binary_search(self._sentences, target, mode)
+        return self._binary_search(
+            self._sentence_starts, self._sentence_ends, target, mode
+        )
 
     def _load_from_json(self, file: JSONFile) -> None:
-        self._type_checker.assert_type(file, "json_file", JSONFile)
+        if not isinstance(file, JSONFile):
+            _TYPE_CHECKER.assert_type(file, "json_file", JSONFile)
         file.assert_exists()
         self._load_from_dict(file.read())
 
@@ -175,32 +265,58 @@ class Transcription:
         self._build_text()
         self._build_word_info()
         self._build_sentence_info()
+        self._build_time_arrays()
+        # the cached elements were built from the previous data
+        for name in _CACHED_ELEMENT_PROPERTIES:
+            self.__dict__.pop(name, None)
 
     def _validate_transcription_dict(self, data: dict) -> None:
-        self._type_checker.assert_dict_elems_type(data, {
+        _TYPE_CHECKER.assert_dict_elems_type(data, {
             "source_software": str,
             "time_created": (datetime, str),
             "language": str,
             "num_speakers": (int, type(None)),
             "char_info": list,
         })
-        for c in data["char_info"]:
-            self._type_checker.assert_type(c, "char_info", dict)
-            self._type_checker.are_dict_elems_of_type(c, {
-                "char": str,
-                "start_time": (float, type(None)),
-                "end_time": (float, type(None)),
-                "speaker": (int, type(None)),
-            })
+        # one pass over the characters, only the first invalid one goes through the
+        # TypeChecker for its error. Their times are checked when converted to arrays
+        invalid = next(
+            (i for i, c in enumerate(data["char_info"]) if not isinstance(c, dict)),
+            None,
+        )
+        if invalid is not None:
+            _TYPE_CHECKER.assert_type(
+                data["char_info"][invalid], "char_info", dict
+            )
 
     def _build_text(self) -> None:
-        self._text = "".join([c["char"] for c in self._chars])
-
-    def _slice_info(self, items: list, start: float, end: float, index_fn) -> list:
+        self._text = "".join(map(itemgetter("char"), self._chars))
+
+    def _build_time_arrays(self) -> None:
+        self._char_starts = _time_array(self._chars, "start_time")
+        self._char_ends = _time_array(self._chars, "end_time")
+        self._word_starts = _time_array(self._words, "start_time")
+        self._word_ends = _time_array(self._words, "end_time")
+        self._sentence_starts = _time_array(self._sentences, "start_time")
+        self._sentence_ends = _time_array(self._sentences, "end_time")
+
+        # missing times are filled forward, so the last character carries the
+        # latest time of the transcription
+        self._end_time = None
+        if len(self._char_ends) > 0:
+            self._end_time = float(max(self._char_ends[-1], self._char_starts[-1]))
+
+    def _slice_info(
+        self,
+        items: list,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        start: float,
+        end: float,
+    ) -> list:
         if start is None and end is None:
             return items
-        start_idx = index_fn(start, "start")
-        end_idx = index_fn(end, "end")
+        start_idx, end_idx = _range_search(starts, ends, start, end)
         return items[start_idx:end_idx + 1]
 
     def _validate_time_range(self, start: float, end: float) -> None:
@@ -211,16 +327,16 @@ class Transcription:
         if start < 0 or start >= end or end > self.end_time:
             raise TranscriptionError("Invalid time range: {} to {}".format(start, end))
 
-    def _binary_search(self, data: list[dict], target: float, mode: str) -> int:
-        left, right = 0, len(data) - 1
-        while left <= right:
-            mid = (left + right) // 2
-            s, e = data[mid]["start_time"], data[mid]["end_time"]
-            if s <= target <= e:
-                return mid
-            elif target > e:
-                left = mid + 1
-            else:
-                right = mid - 1
-
-        return (left - 1 if mode == "start" else right + 1)
+    def _binary_search(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        target: float,
+        mode: str,
+    ) -> int:
+        # last element starting at or before the target
+        index = int(np.searchsorted(starts, target, side="right")) - 1
+        if index >= 0 and target <= ends[index]:
+            return index
+        # the target falls between two elements
+        return index if mode == "start" else index + 1
@@ -10,6 +10,10 @@ class TranscriptionElement:
     Stores shared attributes such as text content and timing information.
     """
 
+    # a transcription has one element per character, word and sentence, slots
+    # store them without a per-instance __dict__
+    __slots__ = ("_start_time", "_end_time", "_start_char", "_end_char", "_text")
+
     def __init__(
         self,
         start_time: float,
@@ -87,7 +91,8 @@ class Sentence(TranscriptionElement):
     Represents a sentence in the transcription.
     Inherits timing and text information from TranscriptionElement.
     """
-    pass
+
+    __slots__ = ()
 
 
 class Word(TranscriptionElement):
@@ -95,7 +100,8 @@ class Word(TranscriptionElement):
     Represents a word in the transcription.
     Inherits timing and text information from TranscriptionElement.
     """
-    pass
+
+    __slots__ = ()
 
 
 class Character:
@@ -103,6 +109,10 @@ class Character:
     Represents a single character with timing and position metadata.
     """
 
+    __slots__ = (
+        "_start_time", "_end_time", "_word_index", "_sentence_index", "_text"
+    )
+
     def __init__(
         self,
         start_time: float,
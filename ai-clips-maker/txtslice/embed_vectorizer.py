@@ -2,8 +2,40 @@
 Embed text using the Roberta model for downstream segmentation tasks.
 """
 
-import torch
-from sentence_transformers import SentenceTransformer
+from __future__ import annotations
+import contextlib
+from functools import lru_cache
+import logging
+from typing import TYPE_CHECKING
+
+# torch and sentence_transformers are imported where they're used, importing them
+# takes seconds and isn't needed until sentences are embedded
+if TYPE_CHECKING:
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+# sentence embedding model of the TextEmbedder
+MODEL_NAME = "all-roberta-large-v1"
+
+
+@lru_cache(maxsize=2)
+def _load_model(name: str, compiled: bool = False) -> SentenceTransformer:
+    """
+    Loads a sentence embedding model once per process, loading it dominates the
+    run time of short transcripts. 'compiled' compiles the model's modules in place
+    with torch.compile, so the compiled and eager models are cached separately.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(name)
+    # Module.compile() was added in torch 2.2, older builds keep the eager model
+    if compiled and hasattr(torch.nn.Module, "compile"):
+        # batches are padded to their longest sentence, compile for dynamic shapes
+        # rather than once per shape
+        for module in model:
+            module.compile(dynamic=True)
+    return model
 
 
 class TextEmbedder:
@@ -12,13 +44,17 @@ class TextEmbedder:
     Useful for semantic comparison and text segmentation.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, compile_model: bool = False) -> None:
         """
-        Initializes the SentenceTransformer model.
+        Initializes the SentenceTransformer model, shared by all TextEmbedders.
+        'compile_model' compiles the model with torch.compile, which saves the
+        per-kernel launch overhead of repeated embedding calls. It falls back to the
+        eager model if compilation isn't supported by the torch build.
         """
-        self.__model = SentenceTransformer("all-roberta-large-v1")
+        self.__compiled = compile_model
+        self.__model = _load_model(MODEL_NAME, compile_model)
 
-    def embed_sentences(self, sentences: list[str]) -> torch.Tensor:
+    def embed_sentences(self, sentences: list[str], batch_size: int = 32) -> torch.Tensor:
         """
         Transforms a list of sentences into embedding vectors.
 
@@ -26,6 +62,9 @@ class TextEmbedder:
         ----------
         sentences: list[str]
             A list of strings, where each string is a sentence.
+        batch_size: int
+            Number of sentences encoded per batch. Sentences are batched by length,
+            so little padding is computed.
 
         Returns
         -------
@@ -33,5 +72,40 @@ class TextEmbedder:
             A 2D tensor of shape (N x E), where N is the number of sentences
             and E is the embedding dimension.
         """
-        embeddings = self.__model.encode(sentences, convert_to_tensor=True)
-        return embeddings
+        import torch
+
+        device_type = self.__model.device.type
+        if device_type == "cuda":
+            # half precision halves the memory traffic of the transformer on GPUs
+            dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+            autocast = torch.autocast(device_type="cuda", dtype=dtype)
+        else:
+            autocast = contextlib.nullcontext()
+
+        # encode() sorts the sentences by length before batching and restores their
+        # order afterwards
+        with torch.inference_mode(), autocast:
+            try:
+                embeddings = self._encode(sentences, batch_size)
+            except Exception as e:
+                if not self.__compiled:
+                    raise
+                logging.warning(
+                    f"Compiling the text embedding model failed, running it eagerly: {e}"
+                )
+                self.__compiled = False
+                self.__model = _load_model(MODEL_NAME)
+                embeddings = self._encode(sentences, batch_size)
+        # the embeddings are small, keep float32 for the downstream cumulative sums
+        return embeddings.float()
+
+    def _encode(self, sentences: list[str], batch_size: int) -> torch.Tensor:
+        """
+        Encodes the sentences with the model into a tensor of embeddings.
+        """
+        return self.__model.encode(
+            sentences,
+            batch_size=batch_size,
+            convert_to_tensor=True,
+            show_progress_bar=False,
+        )
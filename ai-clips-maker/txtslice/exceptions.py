@@ -15,4 +15,17 @@ class TilingAlgorithmError(ClipSegmentationError):
     """
     Raised when the TextTiling algorithm fails due to invalid config or logic issues.
     """
-    pass
\ No newline at end of file
+    pass
+
+class TextTilerError(TilingAlgorithmError):
+    """
+    Raised by the TextTiler for invalid configurations or pooling methods.
+    """
+    pass
+
+
+class ClipFinderError(ClipSegmentationError):
+    """
+    Raised by the ClipFinder when the clips and their embeddings don't match.
+    """
+    pass
@@ -7,6 +7,9 @@ class MediaSegment:
     A time-based and text-based segment of a video/audio file.
     """
 
+    # ClipFinder returns one per clip, slots store them without a __dict__
+    __slots__ = ("_begin_sec", "_finish_sec", "_text_start_idx", "_text_end_idx")
+
     def __init__(
         self,
         begin_sec: float,
@@ -85,9 +88,6 @@ class MediaSegment:
         return not self.__eq__(other)
 
     def __bool__(self) -> bool:
-        return (
-            bool(self._begin_sec)
-            and bool(self._finish_sec)
-            and bool(self._text_start_idx)
-            and bool(self._text_end_idx)
-        )
+        # a segment starting at 0 seconds or at the first character is valid, only
+        # empty segments are falsy
+        return self._finish_sec > self._begin_sec
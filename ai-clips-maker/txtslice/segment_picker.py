@@ -4,12 +4,13 @@ Ideal for generating meaningful portions from transcripts.
 """
 
 import logging
+import numpy
 import torch
 
 from .matcher import MediaSegment
 from .exceptions import ClipFinderError
 from .embed_vectorizer import TextEmbedder
-from .tiler_algorithm import TextTiler, TextTilerConfigManager
+from .tiler_algorithm import TextTiler, TextTilerConfigManager, cumsum_embeddings
 
 from ai_clips_maker.transcribe.transcription import Transcription
 from ai_clips_maker.utils.pytorch import get_compute_device, assert_compute_device_available
@@ -33,9 +34,17 @@ class ClipFinder:
         embedding_aggregation_pool_method: str = "max",
         smoothing_width: int = 3,
         window_compare_pool_method: str = "mean",
+        embedding_batch_size: int = 32,
+        compile_text_tiler: bool = False,
+        compile_text_embedder: bool = False,
     ) -> None:
         """
         Initializes the ClipFinder with segmentation strategy configuration.
+        'embedding_batch_size' is the number of sentences embedded per batch, larger
+        batches are faster on GPUs with enough memory. 'compile_text_tiler' compiles
+        the TextTiler's gap scoring with torch.compile. 'compile_text_embedder'
+        compiles the sentence embedding model, which pays off when many transcripts
+        are processed in one process.
         """
         config_manager = ClipFinderConfigManager()
         config_manager.assert_valid_config(
@@ -58,6 +67,10 @@ class ClipFinder:
         self._max_clip_duration = max_clip_duration
         self._smoothing_width = smoothing_width
         self._window_compare_pool_method = window_compare_pool_method
+        self._embedder = None
+        self._compile_text_embedder = compile_text_embedder
+        self._tiler = TextTiler(self._device, compile_kernel=compile_text_tiler)
+        self._embedding_batch_size = embedding_batch_size
 
     def find_clips(self, transcription: Transcription) -> list[MediaSegment]:
         """
@@ -66,8 +79,34 @@ class ClipFinder:
         sentences_info = transcription.get_sentence_info()
         sentences = [info["sentence"] for info in sentences_info]
 
-        embedder = TextEmbedder()
-        sentence_embeddings = embedder.embed_sentences(sentences)
+        # the embeddings are computed once and reused for every k below
+        if self._embedder is None:
+            self._embedder = TextEmbedder(compile_model=self._compile_text_embedder)
+        sentence_embeddings = self._embedder.embed_sentences(
+            sentences, batch_size=self._embedding_batch_size
+        )
+
+        k_rounds = [
+            ([5, 7], self._min_clip_duration),
+            ([11, 17], 180),
+            ([37, 53, 73, 97], 600),
+        ]
+
+        # the first round of every k tiles the same sentence embeddings, so those
+        # rounds are computed together. Rounds whose clips can't add up to their
+        # minimum duration return early in _text_tile_multiple_rounds(), skip them
+        first_rounds = {}
+        if len(sentence_embeddings) > 8:
+            duration = sentences_info[-1]["end_time"] - sentences_info[0]["start_time"]
+            ks = [
+                k for k_vals, min_sec in k_rounds if duration >= min_sec
+                for k in k_vals
+            ]
+            if ks:
+                first_rounds = dict(zip(
+                    ks,
+                    self._text_tile_multiple_k(sentences_info, sentence_embeddings, ks),
+                ))
 
         clips = []
         if transcription.end_time <= self._max_clip_duration:
@@ -79,7 +118,7 @@ class ClipFinder:
                 "norm": 1.0
             })
 
-        for k_vals, min_sec in [([5, 7], self._min_clip_duration), ([11, 17], 180), ([37, 53, 73, 97], 600)]:
+        for k_vals, min_sec in k_rounds:
             for k in k_vals:
                 clips = self._text_tile_multiple_rounds(
                     sentences_info,
@@ -87,7 +126,8 @@ class ClipFinder:
                     k,
                     min_sec,
                     self._max_clip_duration,
-                    clips
+                    clips,
+                    first_rounds.get(k),
                 )
 
         return [
@@ -107,16 +147,26 @@ class ClipFinder:
         min_clip_duration: int,
         max_clip_duration: int,
         final_clips: list[dict] = [],
+        first_round: tuple[list[dict], torch.Tensor] | None = None,
     ) -> list[dict]:
         """
         Applies multi-round segmentation using TextTiling and filters results.
+        'first_round' is the result of the first round, if already computed.
         """
         self._text_tile_round = 0
+        # every combined clip lies within the clips, so none can be long enough
+        if clips and clips[-1]["end_time"] - clips[0]["start_time"] < min_clip_duration:
+            return final_clips
+
         while len(clip_embeddings) > 8:
             self._text_tile_round += 1
-            super_clips, super_embeddings = self._text_tile(
-                clips, clip_embeddings, k
-            )
+            if first_round is not None:
+                super_clips, super_embeddings = first_round
+                first_round = None
+            else:
+                super_clips, super_embeddings = self._text_tile(
+                    clips, clip_embeddings, k
+                )
             new_clips = self._remove_duplicates(
                 super_clips,
                 final_clips,
@@ -124,6 +174,16 @@ class ClipFinder:
                 max_clip_duration,
             )
             final_clips += new_clips
+
+            # nothing was combined, later rounds would tile the same clips again
+            if len(super_clips) == len(clips):
+                break
+            # combined clips only get longer, so once even the shortest one is too
+            # long, later rounds can't produce a clip
+            shortest = min(clip["end_time"] - clip["start_time"] for clip in super_clips)
+            if shortest > max_clip_duration:
+                break
+
             clips = super_clips
             clip_embeddings = super_embeddings
 
@@ -138,22 +198,57 @@ class ClipFinder:
         """
         Runs the TextTiling algorithm and constructs new combined segments.
         """
+        return self._text_tile_multiple_k(clips, clip_embeddings, [k])[0]
+
+    def _text_tile_multiple_k(
+        self,
+        clips: list[dict],
+        clip_embeddings: torch.tensor,
+        ks: list[int],
+    ) -> list[tuple[list, torch.Tensor]]:
+        """
+        Same as _text_tile() for each k in 'ks', with the TextTiling of all k
+        computed together.
+        """
         if len(clip_embeddings) != len(clips):
             msg = f"Embedding length ({len(clip_embeddings)}) and clips ({len(clips)}) mismatch."
             logging.error(msg)
             raise ClipFinderError(msg)
 
-        tiler = TextTiler(self._device)
-        k = min(k, max(3, len(clip_embeddings)))
+        ks = [min(k, max(3, len(clip_embeddings))) for k in ks]
+
+        # mean pooling sums runs of the embeddings, share their cumulative sum
+        clip_embeddings_cumsum = None
+        if "mean" in (
+            self._window_compare_pool_method, self._embedding_aggregation_pool_method
+        ):
+            clip_embeddings_cumsum = cumsum_embeddings(clip_embeddings)
 
-        boundaries, new_embeddings = tiler.text_tile(
+        tilings = self._tiler.text_tile_multiple_k(
             clip_embeddings,
-            k,
+            ks,
             self._window_compare_pool_method,
             self._embedding_aggregation_pool_method,
             self._smoothing_width,
             self._cutoff_policy,
+            clip_embeddings_cumsum,
         )
+        return [
+            self._combine_clips(clips, boundaries, new_embeddings)
+            for boundaries, new_embeddings in tilings
+        ]
+
+    def _combine_clips(
+        self,
+        clips: list[dict],
+        boundaries: list,
+        new_embeddings: torch.Tensor,
+    ) -> tuple[list, torch.Tensor]:
+        """
+        Combines the clips of each group ending at a boundary into a new segment.
+        """
+        # one device to host transfer for all norms instead of one per clip
+        norms = new_embeddings.pow(2).sum(dim=1).sqrt().tolist()
 
         super_clips = []
         start_idx = 0
@@ -167,7 +262,7 @@ class ClipFinder:
                     "end_char": clips[end_idx]["end_char"],
                     "start_time": clips[start_idx]["start_time"],
                     "end_time": clips[end_idx]["end_time"],
-                    "norm": torch.linalg.norm(new_embeddings[super_idx], dim=0, ord=2).item()
+                    "norm": norms[super_idx]
                 }
                 super_clips.append(combined)
                 start_idx = end_idx
@@ -183,26 +278,29 @@ class ClipFinder:
         max_dur: int,
     ) -> list[dict]:
         """
-        Filters out too short, too long, or overlapping (duplicate) segments.
+        Filters out too short, too long, or overlapping (duplicate) segments. A
+        segment duplicates an existing one if their start and end times differ by
+        less than 15 seconds in total.
         """
-        results = []
-        for clip in potential:
-            duration = clip["end_time"] - clip["start_time"]
-            if not (min_dur <= duration <= max_dur):
-                continue
-            if self._is_duplicate(clip, existing):
-                continue
-            results.append(clip)
-        return results
-
-    def _is_duplicate(self, seg: dict, existing: list[dict]) -> bool:
-        """
-        Determines if segment already exists (based on small time delta).
-        """
-        for ref in existing:
-            if abs(seg["start_time"] - ref["start_time"]) + abs(seg["end_time"] - ref["end_time"]) < 15:
-                return True
-        return False
+        if len(potential) == 0:
+            return []
+
+        starts = numpy.array([clip["start_time"] for clip in potential], dtype=float)
+        ends = numpy.array([clip["end_time"] for clip in potential], dtype=float)
+        durations = ends - starts
+        keep = (min_dur <= durations) & (durations <= max_dur)
+
+        if len(existing) > 0:
+            existing_starts = numpy.array([clip["start_time"] for clip in existing], dtype=float)
+            existing_ends = numpy.array([clip["end_time"] for clip in existing], dtype=float)
+            # (potential, existing) matrix of start and end time differences
+            time_deltas = (
+                numpy.abs(starts[:, None] - existing_starts[None, :])
+                + numpy.abs(ends[:, None] - existing_ends[None, :])
+            )
+            keep &= ~(time_deltas < 15).any(axis=1)
+
+        return [clip for clip, is_kept in zip(potential, keep) if is_kept]
 
 
 class ClipFinderConfigManager(TextTilerConfigManager):
@@ -210,6 +308,16 @@ class ClipFinderConfigManager(TextTilerConfigManager):
     Validates configuration and imputes default values for the segmentation process.
     """
 
+    # settings validated by check_valid_config()
+    _CONFIG_KEYS = (
+        "cutoff_policy",
+        "embedding_aggregation_pool_method",
+        "max_clip_duration",
+        "min_clip_duration",
+        "smoothing_width",
+        "window_compare_pool_method",
+    )
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -228,18 +336,15 @@ class ClipFinderConfigManager(TextTilerConfigManager):
         return config
 
     def check_valid_config(self, cfg: dict) -> str | None:
-        required = [
-            "cutoff_policy",
-            "embedding_aggregation_pool_method",
-            "max_clip_duration",
-            "min_clip_duration",
-            "smoothing_width",
-            "window_compare_pool_method",
-        ]
-        missing = find_missing_dict_keys(cfg, required)
+        missing = find_missing_dict_keys(cfg, list(self._CONFIG_KEYS))
         if missing:
             return f"Missing config values: {missing}"
+        return self._check_valid_settings_memoized(cfg)
 
+    def _check_valid_settings(self, cfg: dict) -> str | None:
+        """
+        check_valid_config() of a config with all settings present, not memoized.
+        """
         err = self.check_valid_clip_times(
             cfg["min_clip_duration"], cfg["max_clip_duration"]
         )
@@ -248,9 +353,9 @@ class ClipFinderConfigManager(TextTilerConfigManager):
 
         validators = {
             "cutoff_policy": self.check_valid_cutoff_policy,
-            "embedding_aggregation_pool_method": self.check_valid_embedding_aggregation_pool_method,
+            "embedding_aggregation_pool_method": self.check_valid_pool_method,
             "smoothing_width": self.check_valid_smoothing_width,
-            "window_compare_pool_method": self.check_valid_window_compare_pool_method,
+            "window_compare_pool_method": self.check_valid_pool_method,
         }
         for key, func in validators.items():
             result = func(cfg[key])
@@ -9,7 +9,7 @@ Notes
     https://arxiv.org/abs/2106.12978
 """
 # standard library imports
-from collections.abc import Awaitable, Callable
+from functools import lru_cache
 import logging
 
 # current package imports
@@ -19,7 +19,6 @@ from .exceptions import TextTilerError
 from ai_clips_maker.filesys.manager import FileSystemManager
 from ai_clips_maker.utils.config_manager import ConfigManager
 from ai_clips_maker.utils.pytorch import (
-    max_magnitude_2d,
     get_compute_device,
     assert_compute_device_available,
 )
@@ -32,6 +31,23 @@ import torch.nn.functional as F
 
 BOUNDARY = 1
 
+# below this many embeddings, kernel launches on an accelerator cost more than the
+# tiling itself, so it runs on the CPU
+MIN_ACCELERATED_NUM_EMBEDDINGS = 128
+
+# number of window values max-magnitude pooled at once, bounds the memory pooling
+# the windows of all gaps takes to about this many values per side
+_MAX_POOLED_WINDOW_VALUES = 2**24
+
+# window functions smooth() can convolve with, by name
+_WINDOWS = {
+    "flat": numpy.ones,
+    "hanning": numpy.hanning,
+    "hamming": numpy.hamming,
+    "bartlett": numpy.bartlett,
+    "blackman": numpy.blackman,
+}
+
 
 class TextTiler:
     """
@@ -41,11 +57,24 @@ class TextTiler:
     as boundaries and each resulting group is pooled into a single embedding.
     """
 
-    def __init__(self, device: str = None) -> None:
+    def __init__(self, device: str = None, compile_kernel: bool = False) -> None:
+        """
+        'compile_kernel' compiles the gap scoring (gap, smoothed and depth scores)
+        with torch.compile, fusing its small operations into fewer kernels. It falls
+        back to eager execution if compilation isn't supported by the torch build.
+        """
         self._device = device or get_compute_device()
         assert_compute_device_available(self._device)
         self._config_checker = TextTilerConfigManager()
         self._fs_manager = FileSystemManager()
+        # configurations that passed validation, text_tile() is called repeatedly
+        # with the same few configurations
+        self._valid_configs = set()
+        self._score_gaps_compiled = None
+        if compile_kernel:
+            # shapes shrink with every round of tiling, compile for dynamic shapes
+            # rather than once per shape
+            self._score_gaps_compiled = torch.compile(self._score_gaps, dynamic=True)
 
     def text_tile(
         self,
@@ -55,98 +84,260 @@ class TextTiler:
         embedding_aggregation_pool_method: str = "max",
         smoothing_width: int = 3,
         cutoff_policy: str = "high",
+        embeddings_cumsum: torch.Tensor | None = None,
     ) -> tuple[list, torch.Tensor]:
         """
         Segments the input embeddings and returns the detected boundaries and
-        pooled segment embeddings.
-        """
-        config = {
-            "k": k,
-            "window_compare_pool_method": window_compare_pool_method,
-            "embedding_aggregation_pool_method": embedding_aggregation_pool_method,
-            "smoothing_width": smoothing_width,
-            "cutoff_policy": cutoff_policy,
-        }
-        self._config_checker.assert_valid_config(config)
+        pooled segment embeddings. 'embeddings_cumsum' is cumsum_embeddings() of the
+        embeddings, passed when the same embeddings are tiled repeatedly (e.g. with
+        different k) so mean pooling doesn't compute it every time.
+        """
+        return self.text_tile_multiple_k(
+            embeddings,
+            [k],
+            window_compare_pool_method,
+            embedding_aggregation_pool_method,
+            smoothing_width,
+            cutoff_policy,
+            embeddings_cumsum,
+        )[0]
+
+    @torch.inference_mode()
+    def text_tile_multiple_k(
+        self,
+        embeddings: torch.Tensor,
+        ks: list[int],
+        window_compare_pool_method: str = "mean",
+        embedding_aggregation_pool_method: str = "max",
+        smoothing_width: int = 3,
+        cutoff_policy: str = "high",
+        embeddings_cumsum: torch.Tensor | None = None,
+    ) -> list[tuple[list, torch.Tensor]]:
+        """
+        Same as text_tile() for each k in 'ks'. The gap, depth and boundary scores
+        of all k are computed together as rows of one tensor, only the pooling of
+        each k's groups runs separately. Runs in inference mode, the embeddings are
+        never trained on.
+        """
+        for k in ks:
+            config_key = (
+                k,
+                window_compare_pool_method,
+                embedding_aggregation_pool_method,
+                smoothing_width,
+                cutoff_policy,
+            )
+            if config_key not in self._valid_configs:
+                config = {
+                    "k": k,
+                    "window_compare_pool_method": window_compare_pool_method,
+                    "embedding_aggregation_pool_method": embedding_aggregation_pool_method,
+                    "smoothing_width": smoothing_width,
+                    "cutoff_policy": cutoff_policy,
+                }
+                self._config_checker.assert_valid_config(config)
+                self._valid_configs.add(config_key)
 
         N, E = embeddings.shape
 
-        if k >= N:
-            new_k = max(N // 5, 2)
-            logging.warning(
-                f"{N} embeddings is too few for k={k}. Using k={new_k} instead."
-            )
-            k = new_k
+        new_ks = []
+        for k in ks:
+            if k >= N:
+                new_k = max(N // 5, 2)
+                logging.warning(
+                    f"{N} embeddings is too few for k={k}. Using k={new_k} instead."
+                )
+                k = new_k
+            new_ks.append(k)
 
         if smoothing_width >= N:
             smoothing_width = 2
 
-        unsmoothed_scores = self._calc_gap_scores(embeddings, k, window_compare_pool_method)
-        smoothed_scores = self._smooth_scores(unsmoothed_scores, smoothing_width)
-        depth_scores = self._calc_depth_scores(smoothed_scores)
+        # pooled embeddings are returned on the device of the embeddings
+        embeddings_device = embeddings.device
+        compute_device = self._device
+        if N < MIN_ACCELERATED_NUM_EMBEDDINGS:
+            compute_device = "cpu"
+        embeddings = embeddings.to(compute_device)
+        if embeddings_cumsum is not None:
+            embeddings_cumsum = embeddings_cumsum.to(compute_device)
+
+        depth_scores = self._run_score_gaps(
+            embeddings,
+            tuple(new_ks),
+            window_compare_pool_method,
+            smoothing_width,
+            embeddings_cumsum,
+        )
         boundaries = self._identify_boundaries(depth_scores, cutoff_policy)
 
-        pooled_embeddings = self._pool_embedding_groups(
-            embeddings, boundaries, embedding_aggregation_pool_method
+        # a single device to host transfer, iterating the tensor would create (and
+        # synchronize) a 0-dim tensor per boundary
+        return [
+            (
+                k_boundaries.tolist(),
+                self._pool_embedding_groups(
+                    embeddings,
+                    k_boundaries,
+                    embedding_aggregation_pool_method,
+                    embeddings_cumsum,
+                ).to(embeddings_device),
+            )
+            for k_boundaries in boundaries
+        ]
+
+    def _run_score_gaps(
+        self,
+        embeddings: torch.Tensor,
+        ks: tuple[int, ...],
+        pool_method: str,
+        smoothing_width: int,
+        embeddings_cumsum: torch.Tensor | None = None,
+    ) -> torch.Tensor:
+        """
+        Runs _score_gaps(), compiled if compilation was requested and works.
+        """
+        if self._score_gaps_compiled is not None:
+            try:
+                return self._score_gaps_compiled(
+                    embeddings, ks, pool_method, smoothing_width, embeddings_cumsum
+                )
+            except TextTilerError:
+                raise
+            except Exception as e:
+                logging.warning(
+                    f"Compiling the TextTiler kernel failed, running it eagerly: {e}"
+                )
+                self._score_gaps_compiled = None
+        return self._score_gaps(
+            embeddings, ks, pool_method, smoothing_width, embeddings_cumsum
         )
 
-        return list(boundaries), pooled_embeddings
+    def _score_gaps(
+        self,
+        embeddings: torch.Tensor,
+        ks: tuple[int, ...],
+        pool_method: str,
+        smoothing_width: int,
+        embeddings_cumsum: torch.Tensor | None = None,
+    ) -> torch.Tensor:
+        """
+        Computes the depth score of each gap between embeddings, one row per k in
+        'ks'. Only tensor operations with no data-dependent shapes, so it can be
+        compiled as a whole.
+        """
+        unsmoothed_scores = self._calc_gap_scores(
+            embeddings, ks, pool_method, embeddings_cumsum
+        )
+        smoothed_scores = self._smooth_scores(unsmoothed_scores, smoothing_width)
+        return self._calc_depth_scores(smoothed_scores)
 
     def _calc_gap_scores(
         self,
         embeddings: torch.Tensor,
-        k: int,
+        ks: tuple[int, ...],
         pool_method: str,
+        embeddings_cumsum: torch.Tensor | None = None,
     ) -> torch.Tensor:
-        pool = self._get_pool_method(pool_method)
+        """
+        Computes the cosine similarity between the pooled windows of up to k
+        embeddings on the left and on the right of each gap, for all gaps at once.
+        Returns one row of gap scores per k in 'ks'.
+        """
         N = embeddings.shape[0]
-        gap_scores = torch.empty(N - 1, device=self._device)
-
-        for i in range(N - 1):
-            left = embeddings[max(0, i - k + 1): i + 1]
-            right = embeddings[i + 1: min(i + 1 + k, N)]
-            left_pooled = pool(left, dim=0)
-            right_pooled = pool(right, dim=0)
-            gap_scores[i] = F.cosine_similarity(left_pooled, right_pooled, dim=0)
+        gaps = torch.arange(N - 1, device=embeddings.device)
+
+        if pool_method == "mean":
+            # window sums are differences of a cumulative sum, csum[j] is the sum of
+            # the first j embeddings. Window bounds have shape (len(ks), N - 1)
+            csum = embeddings_cumsum
+            if csum is None:
+                csum = cumsum_embeddings(embeddings)
+            k = torch.tensor(ks, device=embeddings.device).unsqueeze(1)
+            left_start = (gaps - k + 1).clamp(min=0)
+            right_end = (gaps + 1 + k).clamp(max=N)
+            left_pooled = (csum[gaps + 1] - csum[left_start]) / (
+                (gaps + 1 - left_start).unsqueeze(-1)
+            )
+            right_pooled = (csum[right_end] - csum[gaps + 1]) / (
+                (right_end - gaps - 1).unsqueeze(-1)
+            )
+        elif pool_method == "max":
+            # windows of different sizes can't be unfolded together
+            left_pooled, right_pooled = (
+                torch.stack(pooled)
+                for pooled in zip(*(_max_magnitude_windows(embeddings, k) for k in ks))
+            )
+        else:
+            raise TextTilerError(f"Unknown pool_method: {pool_method}")
 
-        return gap_scores
+        return F.cosine_similarity(left_pooled, right_pooled, dim=-1)
 
     def _smooth_scores(self, scores: torch.Tensor, width: int) -> torch.Tensor:
-        arr = scores.cpu().detach().numpy()
-        return torch.tensor(
-            smooth(numpy.array(arr), window_len=width, window="flat"), device=self._device
-        )
+        """
+        Smooths the scores with a moving average of 'width' scores, along the last
+        dimension. Same as smooth(scores, width, "flat") for each row of scores,
+        computed on the scores' device.
+        """
+        N = scores.shape[-1]
+        if N < width:
+            raise ValueError("Input vector needs to be bigger than window size.")
+        if width < 3:
+            return scores
+
+        # reflect the scores around their first and last values, with the same
+        # (clamped) slices as smooth()
+        head_positions = torch.arange(min(width, N - 1), 1, -1, device=scores.device)
+        tail_positions = torch.arange(N - 1, N - width, -1, device=scores.device)
+        head = 2 * scores[..., :1] - scores[..., head_positions]
+        tail = 2 * scores[..., -1:] - scores[..., tail_positions]
+        padded = torch.cat([head, scores, tail], dim=-1)
+
+        # the flat window is symmetric, so conv1d's correlation is a convolution.
+        # Keep the centered part numpy.convolve(mode="same") returns
+        weights = scores.new_full((1, 1, width), 1 / width)
+        full = F.conv1d(
+            padded.reshape(-1, 1, padded.shape[-1]), weights, padding=width - 1
+        ).view(*padded.shape[:-1], -1)
+        same_start = (width - 1) // 2
+        same = full[..., same_start: same_start + padded.shape[-1]]
+        return same[..., width - 1: -width + 1]
 
     def _calc_depth_scores(self, gap_scores: torch.Tensor) -> torch.Tensor:
-        N = len(gap_scores)
-        depths = torch.zeros(N, device=self._device)
-
-        for i in range(N):
-            g = gap_scores[i]
-            left_peak = max(gap_scores[max(0, i - j)] for j in range(i + 1))
-            right_peak = max(gap_scores[min(N - 1, i + j)] for j in range(N - i))
-            depths[i] = (left_peak - g) + (right_peak - g)
-
-        return depths
+        """
+        Computes how deep each gap score lies below the highest score on its left and
+        on its right (both including the gap itself), as running maximums along the
+        last dimension.
+        """
+        left_peaks = torch.cummax(gap_scores, dim=-1).values
+        right_peaks = torch.cummax(gap_scores.flip(-1), dim=-1).values.flip(-1)
+        return (left_peaks - gap_scores) + (right_peaks - gap_scores)
 
     def _identify_boundaries(self, depths: torch.Tensor, policy: str) -> torch.Tensor:
-        N = len(depths) + 1
-        boundaries = torch.zeros(N, device=self._device)
+        """
+        Marks the boundaries between the embeddings, the depths of each row (along
+        the last dimension) are cut off with their own statistics.
+        """
+        N = depths.shape[-1] + 1
+        boundaries = torch.zeros(*depths.shape[:-1], N, device=depths.device)
 
-        avg, std = torch.mean(depths), torch.std(depths, unbiased=False)
+        avg = torch.mean(depths, dim=-1, keepdim=True)
+        std = torch.std(depths, dim=-1, unbiased=False, keepdim=True)
         cutoff = {"average": avg, "high": avg + std, "low": avg - std}.get(policy)
         if cutoff is None:
             raise TextTilerError(f"Invalid cutoff_policy: {policy}")
 
-        for i in range(len(depths)):
-            if (
-                depths[i] > cutoff and
-                depths[i] > depths[max(0, i - 1)] and
-                depths[i] > depths[min(i + 1, len(depths) - 1)]
-            ):
-                boundaries[i] = 1
+        # a boundary is a local maximum of the depths above the cutoff. The first and
+        # last depths are compared with themselves on their open side, so they
+        # are never local maximums. Compare overlapping views of the depths rather
+        # than shifted copies
+        inner = depths[..., 1:-1]
+        is_boundary = (
+            (inner > cutoff) & (inner > depths[..., :-2]) & (inner > depths[..., 2:])
+        )
+        boundaries[..., 1:N - 2] = is_boundary
 
-        boundaries[N - 1] = BOUNDARY
+        boundaries[..., N - 1] = BOUNDARY
         return boundaries
 
     def _pool_embedding_groups(
@@ -154,27 +345,83 @@ class TextTiler:
         embeddings: torch.Tensor,
         boundaries: list,
         pool_method: str,
+        embeddings_cumsum: torch.Tensor | None = None,
     ) -> torch.Tensor:
-        pool = self._get_pool_method(pool_method)
-        N, E = embeddings.shape
-        pooled = []
-        group = []
+        boundaries = torch.as_tensor(boundaries, device=embeddings.device)
+        # each group ends at (and includes) a boundary
+        group_ends = (boundaries == BOUNDARY).nonzero().flatten()
+        group_starts = F.pad(group_ends[:-1] + 1, (1, 0))
+        group_sizes = group_ends - group_starts + 1
+
+        if pool_method == "mean":
+            # group sums are differences of a cumulative sum over the embeddings
+            csum = embeddings_cumsum
+            if csum is None:
+                csum = cumsum_embeddings(embeddings)
+            group_sums = csum[group_ends + 1] - csum[group_starts]
+            return group_sums / group_sizes.unsqueeze(1)
+
+        if pool_method == "max":
+            # the value with the largest magnitude in a group is either its maximum
+            # or its minimum, both are reduced for all groups at once
+            grouped = embeddings[:group_ends[-1] + 1]
+            group_ids = torch.repeat_interleave(
+                torch.arange(len(group_sizes), device=embeddings.device), group_sizes
+            )
+            index = group_ids.unsqueeze(1).expand_as(grouped)
+            pooled_shape = (len(group_sizes), embeddings.shape[1])
+            group_maxs = grouped.new_zeros(pooled_shape).scatter_reduce(
+                0, index, grouped, reduce="amax", include_self=False
+            )
+            group_mins = grouped.new_zeros(pooled_shape).scatter_reduce(
+                0, index, grouped, reduce="amin", include_self=False
+            )
+            return torch.where(group_maxs >= -group_mins, group_maxs, group_mins)
 
-        for i in range(N):
-            group.append(embeddings[i].unsqueeze(0))
-            if boundaries[i] == BOUNDARY:
-                group_tensor = torch.cat(group, dim=0)
-                pooled.append(pool(group_tensor, dim=0))
-                group = []
+        raise TextTilerError(f"Unknown pool_method: {pool_method}")
 
-        return torch.stack(pooled)
 
-    def _get_pool_method(self, name: str) -> Callable[[torch.Tensor], Awaitable[torch.Tensor]]:
-        if name == "mean":
-            return torch.mean
-        if name == "max":
-            return max_magnitude_2d
-        raise TextTilerError(f"Unknown pool_method: {name}")
+def cumsum_embeddings(embeddings: torch.Tensor) -> torch.Tensor:
+    """
+    Returns the cumulative sums of the embeddings with a leading row of zeros, so
+    row j is the sum of the first j embeddings and any run of embeddings sums to a
+    difference of two rows.
+    """
+    return F.pad(embeddings.cumsum(dim=0), (0, 0, 1, 0))
+
+
+def _max_magnitude_windows(
+    embeddings: torch.Tensor, k: int
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """
+    Max-magnitude pools the windows of up to k embeddings on the left and on the
+    right of each gap between the embeddings. The gaps are pooled in chunks, pooling
+    all of them at once takes memory for N * E * k values.
+    """
+    N, E = embeddings.shape
+    # zero padding never has the largest magnitude, so windows cut off at the edges
+    # can be padded to a full k embeddings
+    padding = embeddings.new_zeros(k - 1, embeddings.shape[1])
+    # windows of shape (N, E, k), window j ends (left) or starts (right) at j
+    left_windows = torch.cat([padding, embeddings]).unfold(0, k, 1)
+    right_windows = torch.cat([embeddings, padding]).unfold(0, k, 1)
+    num_gaps_per_chunk = max(_MAX_POOLED_WINDOW_VALUES // (E * k), 1)
+    return tuple(
+        torch.cat([
+            _max_magnitude_last_dim(chunk)
+            for chunk in windows.split(num_gaps_per_chunk)
+        ])
+        for windows in (left_windows[:N - 1], right_windows[1:])
+    )
+
+
+def _max_magnitude_last_dim(tensor: torch.Tensor) -> torch.Tensor:
+    """
+    Returns the values with the largest magnitude along the last dimension, keeping
+    their sign. Same as max_magnitude_2d, for windows stacked along the first dim.
+    """
+    indices = tensor.abs().argmax(dim=-1, keepdim=True)
+    return torch.gather(tensor, -1, indices).squeeze(-1)
 
 
 def smooth(x, window_len=3, window="flat"):
@@ -184,28 +431,58 @@ def smooth(x, window_len=3, window="flat"):
         raise ValueError("Input vector needs to be bigger than window size.")
     if window_len < 3:
         return x
-    if window not in ["flat", "hanning", "hamming", "bartlett", "blackman"]:
+    if window not in _WINDOWS:
         raise ValueError("Invalid window type.")
 
     s = numpy.r_[2 * x[0] - x[window_len:1:-1], x, 2 * x[-1] - x[-1:-window_len:-1]]
-    w = numpy.ones(window_len) if window == "flat" else eval(f"numpy.{window}({window_len})")
+    w = _WINDOWS[window](window_len)
     y = numpy.convolve(w / w.sum(), s, mode="same")
     return y[window_len - 1: -window_len + 1]
 
 
+@lru_cache(maxsize=64, typed=True)
+def _check_valid_settings(manager_class: type, *settings) -> str | None:
+    """
+    Memoized manager_class()._check_valid_settings() of the settings, given in the
+    order of manager_class._CONFIG_KEYS. Settings are typed so that e.g. k=3.0
+    isn't mistaken for a validated k=3.
+    """
+    config = dict(zip(manager_class._CONFIG_KEYS, settings))
+    return manager_class()._check_valid_settings(config)
+
+
 class TextTilerConfigManager(ConfigManager):
+    # settings validated by check_valid_config()
+    _CONFIG_KEYS = (
+        "cutoff_policy", "embedding_aggregation_pool_method",
+        "k", "smoothing_width", "window_compare_pool_method",
+    )
+
     def __init__(self) -> None:
         super().__init__()
 
     def check_valid_config(self, config: dict) -> str | None:
-        required = [
-            "cutoff_policy", "embedding_aggregation_pool_method",
-            "k", "smoothing_width", "window_compare_pool_method",
-        ]
-        missing = find_missing_dict_keys(config, required)
+        missing = find_missing_dict_keys(config, list(self._CONFIG_KEYS))
         if missing:
             return f"TextTiler missing config settings: {missing}"
+        return self._check_valid_settings_memoized(config)
 
+    def _check_valid_settings_memoized(self, config: dict) -> str | None:
+        """
+        Validates the settings of 'config' with _check_valid_settings(). The settings
+        are a few enums and small integers, so results are memoized per combination.
+        """
+        settings = tuple(config[key] for key in self._CONFIG_KEYS)
+        try:
+            return _check_valid_settings(type(self), *settings)
+        except TypeError:
+            # unhashable settings can't be memoized
+            return self._check_valid_settings(config)
+
+    def _check_valid_settings(self, config: dict) -> str | None:
+        """
+        check_valid_config() of a config with all settings present, not memoized.
+        """
         checkers = {
             "cutoff_policy": self.check_valid_cutoff_policy,
             "embedding_aggregation_pool_method": self.check_valid_pool_method,
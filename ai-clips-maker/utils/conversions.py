@@ -42,18 +42,19 @@ def seconds_to_hms_time_format(seconds: float, num_digits: int = 3) -> str:
     if num_digits < 0:
         raise ValueError(f"num_digits ({num_digits}) cannot be negative.")
 
-    is_negative = seconds < 0
-    seconds = abs(seconds)
-
-    hours = int(seconds // 3600)
-    remainder = seconds % 3600
-    minutes = int(remainder // 60)
-    secs = round(remainder % 60, num_digits)
-
-    width = 3 + num_digits - (num_digits == 0)
-    formatted = f"{hours:02}:{minutes:02}:{secs:0{width}.{num_digits}f}"
-
-    return f"-{formatted}" if is_negative and (hours + minutes + secs) != 0 else formatted
+    # round before splitting so rounding up carries into the minutes and hours
+    # rather than printing 60 seconds
+    total = round(abs(seconds), num_digits)
+    whole_secs = int(total)
+    hours, remainder = divmod(whole_secs, SECS_PER_HOUR)
+    minutes, secs = divmod(remainder, SECS_PER_MIN)
+
+    width = 3 + num_digits if num_digits else 2
+    sign = "-" if seconds < 0 and total else ""
+    return (
+        f"{sign}{hours:02}:{minutes:02}:"
+        f"{secs + (total - whole_secs):0{width}.{num_digits}f}"
+    )
 
 
 def hms_time_format_to_seconds(hms_time: str) -> float:
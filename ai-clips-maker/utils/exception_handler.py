@@ -12,6 +12,9 @@ from .exceptions import InvalidInputDataError
 # local imports
 from ai_clips_maker.transcribe.exceptions import NoSpeechError
 
+# ends each formatted stack trace line
+STACK_TRACE_LINE_END = "#" * 10
+
 
 class ExceptionHandler:
     """
@@ -57,21 +60,16 @@ class ExceptionHandler:
         if exc_type is None:
             return ["No active exception."]
 
-        formatted_trace = []
-        summary = traceback.extract_tb(exc_tb)
-        error_type = exc_type.__name__
-        error_msg = str(exc_value)
-
-        for frame in summary:
-            message = (
-                f"Error Type: {error_type} | "
-                f"Filename: {frame.filename} | "
-                f"Function: {frame.name} | "
-                f"Line: {frame.lineno} | "
-                f"Code: {frame.line!r} | "
-                f"Message: {error_msg} | "
-                + "#" * 10
-            )
-            formatted_trace.append(message)
+        # the error type and message are the same for every frame
+        prefix = f"Error Type: {exc_type.__name__} | "
+        suffix = f"Message: {exc_value} | {STACK_TRACE_LINE_END}"
 
-        return formatted_trace
+        return [
+            f"{prefix}"
+            f"Filename: {frame.filename} | "
+            f"Function: {frame.name} | "
+            f"Line: {frame.lineno} | "
+            f"Code: {frame.line!r} | "
+            f"{suffix}"
+            for frame in traceback.extract_tb(exc_tb)
+        ]
@@ -3,17 +3,29 @@ Utility functions for PyTorch computations and device handling.
 """
 
 # built-in imports
+from __future__ import annotations
+import atexit
+from functools import lru_cache
 import logging
 import random
+import threading
+from typing import TYPE_CHECKING
 
 # 3rd party imports
-import torch
 import psutil
-import pynvml
 
 # local package imports
 from .exceptions import InvalidComputeDeviceError
 
+# torch and pynvml are imported where they're used, importing them loads the CUDA
+# and NVML libraries, which callers validating device names don't need
+if TYPE_CHECKING:
+    import torch
+
+# NVML handle of the first GPU, NVML is initialized once on first use
+_NVML_HANDLE = None
+_NVML_LOCK = threading.Lock()
+
 
 def get_valid_torch_devices() -> list[str]:
     """
@@ -79,6 +91,8 @@ def get_compute_device() -> str:
     str
         'cuda' if available, otherwise 'cpu'
     """
+    import torch
+
     return "cuda" if torch.cuda.is_available() else "cpu"
 
 
@@ -98,6 +112,10 @@ def check_compute_device_available(device: str) -> str | None:
     msg = check_valid_torch_device(device)
     if msg:
         return msg
+    if device == "cpu":
+        return None
+
+    import torch
 
     if device == "cuda" and not torch.cuda.is_available():
         return "CUDA device not available."
@@ -146,18 +164,17 @@ def max_magnitude_2d(tensor: torch.Tensor, dim: int) -> torch.Tensor:
     torch.Tensor
         Tensor of max values along the specified axis.
     """
+    import torch
+
     if not torch.is_tensor(tensor):
         raise TypeError(f"'tensor' must be a torch.Tensor, got {type(tensor)}")
     if dim not in (0, 1):
         raise ValueError(f"'dim' must be 0 or 1, got {dim}")
 
-    abs_tensor = torch.abs(tensor)
-    _, indices = torch.max(abs_tensor, dim=dim)
-
-    if dim == 0:
-        return tensor[indices, torch.arange(tensor.shape[1])]
-    else:
-        return tensor[torch.arange(tensor.shape[0]), indices]
+    # gather the signed values at the indices of the largest magnitudes, no index
+    # tensor for the other axis is needed
+    indices = tensor.abs().argmax(dim=dim, keepdim=True)
+    return tensor.gather(dim, indices).squeeze(dim)
 
 
 def reset_seed(seed: int) -> None:
@@ -168,10 +185,38 @@ def reset_seed(seed: int) -> None:
     ----------
     seed: int
     """
+    import torch
+
     random.seed(seed)
     torch.manual_seed(seed)
 
 
+@lru_cache(maxsize=1)
+def _is_cuda_available() -> bool:
+    """
+    Returns torch.cuda.is_available(), which can't change while the process runs.
+    """
+    import torch
+
+    return torch.cuda.is_available()
+
+
+def _get_nvml_handle():
+    """
+    Returns the NVML handle of the first GPU. NVML is initialized on the first call
+    and shut down when the interpreter exits.
+    """
+    import pynvml
+
+    global _NVML_HANDLE
+    with _NVML_LOCK:
+        if _NVML_HANDLE is None:
+            pynvml.nvmlInit()
+            atexit.register(pynvml.nvmlShutdown)
+            _NVML_HANDLE = pynvml.nvmlDeviceGetHandleByIndex(0)
+    return _NVML_HANDLE
+
+
 def mem_stats() -> dict:
     """
     Retrieves current CPU and GPU memory stats.
@@ -185,13 +230,17 @@ def mem_stats() -> dict:
         }
     """
     gpu_stats = {"total": 0, "free": 0}
-    if torch.cuda.is_available():
-        torch.cuda.empty_cache()
-        pynvml.nvmlInit()
-        handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-        info = pynvml.nvmlDeviceGetMemoryInfo(handle)
+    if _is_cuda_available():
+        import pynvml
+        import torch
+
+        info = pynvml.nvmlDeviceGetMemoryInfo(_get_nvml_handle())
+        # memory cached by torch's allocator is free for this process, count it
+        # rather than emptying the cache, which syncs the device and makes later
+        # allocations go through the driver again
+        cached = torch.cuda.memory_reserved() - torch.cuda.memory_allocated()
         gpu_stats["total"] = info.total
-        gpu_stats["free"] = info.free
+        gpu_stats["free"] = info.free + cached
 
     cpu_mem = psutil.virtual_memory()
     cpu_stats = {
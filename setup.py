@@ -60,5 +60,12 @@ setup(
             "pytest",
             "twine",
         ],
+        "fast": [
+            "orjson",
+        ],
+        "onnx": [
+            "onnx",
+            "onnxruntime",
+        ],
     },
 )
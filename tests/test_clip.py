@@ -1,10 +1,13 @@
 # Third-party imports
+import numpy as np
 import pytest
+import torch
+import torch.nn.functional as F
 from unittest.mock import MagicMock
 
 # Local package imports
-from ai_clips_maker.clip.clipfinder import ClipFinderConfigManager
-from ai_clips_maker.clip.texttiler import TextTilerConfigManager
+from ai_clips_maker.txtslice.segment_picker import ClipFinder, ClipFinderConfigManager
+from ai_clips_maker.txtslice.tiler_algorithm import TextTiler, TextTilerConfigManager
 from ai_clips_maker.transcribe.transcription import Transcription
 
 
@@ -17,6 +20,14 @@ def clip_finder_config_manager():
 def texttiler_config_manager():
     return TextTilerConfigManager()
 
+@pytest.fixture(scope="module")
+def text_tiler():
+    return TextTiler(device="cpu")
+
+@pytest.fixture(scope="module")
+def clip_finder():
+    return ClipFinder(device="cpu")
+
 @pytest.fixture
 def valid_transcription():
     mock_transcription = MagicMock(spec=Transcription)
@@ -89,3 +100,179 @@ def test_invalid_texttiler_config(texttiler_config_manager: TextTilerConfigManag
     }
     result = texttiler_config_manager.check_valid_config(config)
     assert isinstance(result, str)
+
+
+# ----------------------------
+# TextTiler Tests
+# ----------------------------
+
+def _reference_max_magnitude(tensor: torch.Tensor) -> torch.Tensor:
+    """
+    Values with the largest magnitude of each column, keeping their sign.
+    """
+    indices = tensor.abs().argmax(dim=0)
+    return tensor[indices, torch.arange(tensor.shape[1])]
+
+
+def _reference_text_tile(
+    embeddings, k, window_compare_pool_method, embedding_aggregation_pool_method,
+    smoothing_width, cutoff_policy,
+):
+    """
+    Straightforward TextTiling with one loop iteration per gap, the implementation
+    TextTiler's vectorized kernels replaced.
+    """
+    pools = {"mean": torch.mean, "max": lambda t, dim: _reference_max_magnitude(t)}
+    N = len(embeddings)
+    if k >= N:
+        k = max(N // 5, 2)
+    if smoothing_width >= N:
+        smoothing_width = 2
+
+    compare_pool = pools[window_compare_pool_method]
+    gap_scores = torch.empty(N - 1)
+    for i in range(N - 1):
+        left = compare_pool(embeddings[max(0, i - k + 1): i + 1], dim=0)
+        right = compare_pool(embeddings[i + 1: min(i + 1 + k, N)], dim=0)
+        gap_scores[i] = F.cosine_similarity(left, right, dim=0)
+
+    x = gap_scores.numpy()
+    if smoothing_width >= 3:
+        w = smoothing_width
+        padded = np.r_[2 * x[0] - x[w:1:-1], x, 2 * x[-1] - x[-1:-w:-1]]
+        x = np.convolve(np.ones(w) / w, padded, mode="same")[w - 1: -w + 1]
+    scores = torch.tensor(x)
+
+    depths = torch.zeros(len(scores))
+    for i in range(len(scores)):
+        left_peak = scores[:i + 1].max()
+        right_peak = scores[i:].max()
+        depths[i] = (left_peak - scores[i]) + (right_peak - scores[i])
+
+    avg, std = torch.mean(depths), torch.std(depths, unbiased=False)
+    cutoff = {"average": avg, "high": avg + std, "low": avg - std}[cutoff_policy]
+    boundaries = torch.zeros(N)
+    for i in range(len(depths)):
+        if (
+            depths[i] > cutoff
+            and depths[i] > depths[max(0, i - 1)]
+            and depths[i] > depths[min(i + 1, len(depths) - 1)]
+        ):
+            boundaries[i] = 1
+    boundaries[N - 1] = 1
+
+    aggregation_pool = pools[embedding_aggregation_pool_method]
+    pooled, group_start = [], 0
+    for i in range(N):
+        if boundaries[i] == 1:
+            pooled.append(aggregation_pool(embeddings[group_start: i + 1], dim=0))
+            group_start = i + 1
+    return boundaries.tolist(), torch.stack(pooled)
+
+
+@pytest.mark.parametrize("cutoff_policy", ["average", "high", "low"])
+@pytest.mark.parametrize("embedding_aggregation_pool_method", ["mean", "max"])
+@pytest.mark.parametrize("window_compare_pool_method", ["mean", "max"])
+@pytest.mark.parametrize(
+    "num_embeddings, k, smoothing_width",
+    [(9, 5, 3), (30, 7, 3), (60, 11, 5), (120, 17, 3), (40, 97, 3), (12, 3, 20)],
+    ids=[
+        "few", "small", "wide_smoothing", "large", "k_too_large", "smoothing_too_wide"
+    ],
+)
+def test_text_tile_matches_reference(
+    text_tiler,
+    num_embeddings,
+    k,
+    smoothing_width,
+    window_compare_pool_method,
+    embedding_aggregation_pool_method,
+    cutoff_policy,
+):
+    """
+    Ensure the vectorized TextTiler produces the boundaries and pooled embeddings
+    of the per-gap reference implementation.
+    """
+    embeddings = torch.randn(
+        num_embeddings, 16, generator=torch.Generator().manual_seed(num_embeddings)
+    )
+    config = (
+        window_compare_pool_method,
+        embedding_aggregation_pool_method,
+        smoothing_width,
+        cutoff_policy,
+    )
+
+    boundaries, pooled = text_tiler.text_tile(embeddings, k, *config)
+    expected_boundaries, expected_pooled = _reference_text_tile(embeddings, k, *config)
+
+    assert boundaries == expected_boundaries
+    torch.testing.assert_close(pooled, expected_pooled)
+
+
+def test_text_tile_multiple_k_matches_text_tile(text_tiler):
+    """
+    Ensure tiling several k at once gives the same results as tiling each k.
+    """
+    embeddings = torch.randn(80, 16, generator=torch.Generator().manual_seed(0))
+    ks = [5, 7, 11, 17, 37, 97]
+
+    tilings = text_tiler.text_tile_multiple_k(embeddings, ks, "max", "mean")
+
+    for k, (boundaries, pooled) in zip(ks, tilings):
+        expected_boundaries, expected_pooled = text_tiler.text_tile(
+            embeddings, k, "max", "mean"
+        )
+        assert boundaries == expected_boundaries
+        torch.testing.assert_close(pooled, expected_pooled)
+
+
+# ----------------------------
+# ClipFinder Tests
+# ----------------------------
+
+def _reference_remove_duplicates(potential, existing, min_dur, max_dur):
+    """
+    Filters the clips one at a time against every existing clip.
+    """
+    results = []
+    for clip in potential:
+        duration = clip["end_time"] - clip["start_time"]
+        if not (min_dur <= duration <= max_dur):
+            continue
+        if any(
+            abs(clip["start_time"] - ref["start_time"])
+            + abs(clip["end_time"] - ref["end_time"]) < 15
+            for ref in existing
+        ):
+            continue
+        results.append(clip)
+    return results
+
+
+def _random_clips(rng: np.random.Generator, num_clips: int) -> list[dict]:
+    """
+    Clips on a whole second grid, so durations and time differences hit the
+    filter's limits exactly.
+    """
+    starts = rng.integers(0, 600, size=num_clips)
+    durations = rng.integers(0, 300, size=num_clips)
+    return [
+        {"start_time": int(start), "end_time": int(start + duration)}
+        for start, duration in zip(starts, durations)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_remove_duplicates_matches_reference(clip_finder, seed):
+    """
+    Ensure the vectorized duplicate filter keeps the same clips, in the same
+    order, as comparing them one at a time.
+    """
+    rng = np.random.default_rng(seed)
+    potential = _random_clips(rng, int(rng.integers(0, 40)))
+    existing = _random_clips(rng, int(rng.integers(0, 40)))
+
+    result = clip_finder._remove_duplicates(potential, existing, 15, 180)
+
+    assert result == _reference_remove_duplicates(potential, existing, 15, 180)
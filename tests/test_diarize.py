@@ -1,13 +1,20 @@
 # Standard library imports
+import copy
 from unittest.mock import patch, Mock
 
 # Local imports
-from ai_clips_maker.diarize.pyannote import PyannoteDiarizer
+from ai_clips_maker.diarize.onnx_embedding import (
+    OnnxSpeakerEmbedding,
+    export_embedding_to_onnx,
+)
+from ai_clips_maker.diarize.pyannote import PYANNOTE_SAMPLE_RATE, PyannoteDiarizer
 
 # Third-party imports
+import numpy as np
 import pandas as pd
 from pyannote.core import Segment, Annotation
 import pytest
+import torch
 
 
 @pytest.fixture
@@ -25,11 +32,14 @@ def mock_diarizer():
 @pytest.fixture
 def mock_audio_file():
     """
-    Creates a mocked audio file with mocked path and duration.
+    Creates a mocked audio file with mocked path, duration and decoded samples.
     """
     mock_audio_file = Mock()
     mock_audio_file.path.return_value = "mock_audio.mp3"
     mock_audio_file.get_duration.return_value = 30.0
+    mock_audio_file.decode_samples.return_value = np.zeros(
+        (1, 30 * PYANNOTE_SAMPLE_RATE), dtype=np.float32
+    )
     return mock_audio_file
 
 
@@ -149,5 +159,117 @@ def test_diarize(mock_diarizer, mock_audio_file, annotation_data, expected_outpu
     # Run diarization
     output_segments = mock_diarizer.diarize(mock_audio_file)
 
+    # Check the pipeline ran on the decoded samples
+    mock_audio_file.decode_samples.assert_called_once_with(
+        PYANNOTE_SAMPLE_RATE, num_channels=1
+    )
+    (pipeline_input,), _ = mock_diarizer.pipeline.call_args
+    assert set(pipeline_input) == {"waveform", "sample_rate"}
+    assert pipeline_input["sample_rate"] == PYANNOTE_SAMPLE_RATE
+    assert tuple(pipeline_input["waveform"].shape) == (1, 30 * PYANNOTE_SAMPLE_RATE)
+
     # Check output
     assert output_segments == expected_output
+
+
+def _reference_adjust_segments(
+    annotation, duration, min_segment_duration, time_precision
+):
+    """
+    Merges the speaker tracks one at a time, the implementation the vectorized
+    PyannoteDiarizer._adjust_segments() replaced.
+    """
+    segments = []
+    cur_start, cur_speaker = 0.0, None
+    for segment, _, label in annotation.itertracks(yield_label=True):
+        if segment.end - segment.start < min_segment_duration:
+            continue
+        speaker = int(label.split("_")[1])
+        if cur_speaker is None:
+            cur_speaker = speaker
+        elif speaker != cur_speaker:
+            segments.append({
+                "speakers": [cur_speaker],
+                "start_time": round(cur_start, time_precision),
+                "end_time": round(segment.start, time_precision),
+            })
+            cur_speaker, cur_start = speaker, segment.start
+    segments.append({
+        "speakers": [cur_speaker] if cur_speaker is not None else [],
+        "start_time": round(cur_start, time_precision),
+        "end_time": round(duration, time_precision),
+    })
+
+    speakers = sorted({s for segment in segments for s in segment["speakers"]})
+    mapping = {old: new for new, old in enumerate(speakers)}
+    for segment in segments:
+        segment["speakers"] = [mapping[s] for s in segment["speakers"]]
+    return segments
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_adjust_segments_matches_reference(mock_diarizer, seed):
+    """
+    Ensure the vectorized segment merging produces the segments of merging the
+    speaker tracks one at a time, on random annotations with overlapping, short
+    and repeated speaker tracks.
+    """
+    rng = np.random.default_rng(seed)
+    num_tracks = int(rng.integers(0, 60))
+    annotation = Annotation()
+    for track in range(num_tracks):
+        start = float(rng.uniform(0, 300))
+        end = start + float(rng.exponential(5))
+        speaker = int(rng.integers(0, 6)) * 2
+        annotation[Segment(start, end), track] = f"SPEAKER_{speaker:02d}"
+
+    output_segments = mock_diarizer._adjust_segments(annotation, 310.0, 1.5, 6)
+
+    assert output_segments == _reference_adjust_segments(annotation, 310.0, 1.5, 6)
+
+
+class _TinyEmbeddingModel(torch.nn.Module):
+    """
+    Stand-in for the pipeline's speaker embedding model, taking waveforms and frame
+    weights like the exported model does.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.linear = torch.nn.Linear(2, 4)
+
+    def forward(self, waveforms, weights):
+        mean = waveforms.mean(dim=-1)
+        weight = weights.sum(dim=-1, keepdim=True)
+        return self.linear(torch.cat([mean, mean * weight], dim=-1))
+
+
+def test_onnx_speaker_embedding(tmp_path):
+    """
+    Checks that an exported model run through OnnxSpeakerEmbedding matches the
+    PyTorch model, with and without frame weights, and that the wrapper delegates
+    attributes and can be copied.
+    """
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    torch.manual_seed(0)
+    embedding = Mock(model_=_TinyEmbeddingModel(), dimension=4)
+    onnx_path = str(tmp_path / "embedding.onnx")
+    export_embedding_to_onnx(embedding, onnx_path, quantize=False)
+    onnx_embedding = OnnxSpeakerEmbedding(embedding, onnx_path)
+
+    # 2s chunks, weighted per frame of the segmentation model
+    waveforms = torch.randn(3, 1, 2 * PYANNOTE_SAMPLE_RATE)
+    masks = torch.rand(3, 118)
+    with torch.inference_mode():
+        expected = embedding.model_(waveforms, masks).numpy()
+        expected_unweighted = embedding.model_(waveforms, torch.ones(3, 118)).numpy()
+
+    np.testing.assert_allclose(
+        onnx_embedding(waveforms, masks), expected, rtol=1e-4, atol=1e-5
+    )
+    np.testing.assert_allclose(
+        onnx_embedding(waveforms), expected_unweighted, rtol=1e-4, atol=1e-5
+    )
+    assert onnx_embedding.dimension == 4
+    assert copy.copy(onnx_embedding).dimension == 4
@@ -1,9 +1,13 @@
 """
-Unit tests for the Rect class used for representing rectangular regions.
+Unit tests for the Rect and RectArray classes used for representing rectangular regions.
 """
 
 # local imports
-from ai_clips_maker.resize.rect import Rect
+from ai_clips_maker.resize.rect import Rect, RectArray
+
+# third party imports
+import numpy as np
+import pytest
 
 
 def test_rect_initialization():
@@ -40,4 +44,50 @@ def test_rect_div_operator():
 
 def test_rect_equality_check():
     assert Rect(1, 2, 3, 4) == Rect(1, 2, 3, 4)
-    assert Rect(1, 2, 3, 4) != Rect(0, 0, 0, 0)
\ No newline at end of file
+    assert Rect(1, 2, 3, 4) != Rect(0, 0, 0, 0)
+
+
+@pytest.fixture
+def rects():
+    rng = np.random.default_rng(0)
+    return [Rect(*map(int, xywh)) for xywh in rng.integers(-2000, 2000, size=(50, 4))]
+
+
+def test_rect_array_round_trip(rects):
+    rect_array = RectArray.from_rects(rects)
+    assert len(rect_array) == len(rects)
+    assert rect_array.to_rects() == rects
+
+
+def test_rect_array_from_corners():
+    rect_array = RectArray.from_corners(np.array([[1, 2, 4, 6], [0, 0, 10, 5]]))
+    assert rect_array.to_rects() == [Rect(1, 2, 3, 4), Rect(0, 0, 10, 5)]
+
+
+def test_rect_array_sum(rects):
+    expected = Rect(0, 0, 0, 0)
+    for rect in rects:
+        expected = expected + rect
+    assert RectArray.from_rects(rects).sum() == expected
+
+
+def test_rect_array_sum_does_not_overflow():
+    rect = Rect(2**30, 2**30, 2**30, 2**30)
+    assert RectArray.from_rects([rect] * 4).sum() == Rect(2**32, 2**32, 2**32, 2**32)
+
+
+def test_rect_array_add_operator(rects):
+    result = RectArray.from_rects(rects) + RectArray.from_rects(rects[::-1])
+    assert result.to_rects() == [a + b for a, b in zip(rects, rects[::-1])]
+
+
+@pytest.mark.parametrize("factor", [2, -3, 0.5, 1.7, -0.3, 2.5])
+def test_rect_array_mul_operator(rects, factor):
+    result = RectArray.from_rects(rects) * factor
+    assert result.to_rects() == [rect * factor for rect in rects]
+
+
+@pytest.mark.parametrize("factor", [2, -3, 0.5, 1.7, -0.3, 2.5])
+def test_rect_array_div_operator(rects, factor):
+    result = RectArray.from_rects(rects) / factor
+    assert result.to_rects() == [rect / factor for rect in rects]
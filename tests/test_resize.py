@@ -1,14 +1,36 @@
 # Standard library imports
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 # Local package imports
-from ai_clips_maker.media.video_file import VideoFile
 from ai_clips_maker.resize.resizer import Resizer
 from ai_clips_maker.resize.rect import Rect
 
 # Third-party imports
 import pytest
 
+
+class _FakeVideoFile:
+    """
+    Stands in for a VideoFile where the Resizer only reads the video's dimensions.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+
+    def get_width_pixels(self) -> int:
+        return self.width
+
+    def get_height_pixels(self) -> int:
+        return self.height
+
+
+@pytest.fixture(scope="module")
+def resizer():
+    # the face detection models load once for all the tests of the module
+    return Resizer()
+
+
 # --- Tests for _calc_resize_width_and_height_pixels() ---
 @pytest.mark.parametrize(
     "original_width, original_height, aspect_ratio, expected",
@@ -27,8 +49,7 @@ import pytest
         (4500, 8000, (9, 16), (4500, 8000)),
     ],
 )
-def test_calc_resize_dimensions(original_width, original_height, aspect_ratio, expected):
-    resizer = Resizer()
+def test_calc_resize_dimensions(original_width, original_height, aspect_ratio, expected, resizer):
     result = resizer._calc_resize_width_and_height_pixels(
         original_width_pixels=original_width,
         original_height_pixels=original_height,
@@ -58,9 +79,41 @@ def test_calc_resize_dimensions(original_width, original_height, aspect_ratio, e
          [5.1],
          [{"speakers": [0], "start_time": 0, "end_time": 5.1}, {"speakers": [1], "start_time": 5.1, "end_time": 10}]),
     ],
+    ids=[
+        "no_scene_changes",
+        "scene_change_at_end",
+        "split_segment",
+        "split_both_segments",
+        "scene_change_at_boundary",
+        "snap_boundary_back",
+        "snap_boundary_forward",
+    ],
 )
-def test_merge_speaker_scene_segments(speaker_segments, scene_changes, expected):
-    resizer = Resizer()
+def test_merge_speaker_scene_segments(speaker_segments, scene_changes, expected, resizer):
+    result = resizer._merge_scene_change_and_speaker_segments(
+        speaker_segments=speaker_segments,
+        scene_changes=scene_changes,
+        scene_merge_threshold=0.25,
+    )
+    assert result == expected
+
+def test_merge_speaker_scene_segments_many(resizer):
+    # a scene change in the middle of every other segment, a merge that copies the
+    # segments for each inserted segment takes quadratic time on this input
+    n_segments = 10_000
+    speaker_segments = [
+        {"speakers": [i % 2], "start_time": i, "end_time": i + 1}
+        for i in range(n_segments)
+    ]
+    scene_changes = [i + 0.5 for i in range(0, n_segments, 2)]
+    expected = []
+    for i in range(n_segments):
+        if i % 2 == 0:
+            expected.append({"speakers": [0], "start_time": i, "end_time": i + 0.5})
+            expected.append({"speakers": [0], "start_time": i + 0.5, "end_time": i + 1})
+        else:
+            expected.append({"speakers": [1], "start_time": i, "end_time": i + 1})
+
     result = resizer._merge_scene_change_and_speaker_segments(
         speaker_segments=speaker_segments,
         scene_changes=scene_changes,
@@ -81,18 +134,13 @@ def test_merge_speaker_scene_segments(speaker_segments, scene_changes, expected)
         (1920, 1080, 100, True, 960, 8, 8),
     ],
 )
-def test_calc_batches(width, height, num_frames, gpu_available, face_detect_width, n_face_detect_batches, expected_batches):
-    mock_video = MagicMock(spec=VideoFile)
-    mock_video.get_width_pixels.return_value = width
-    mock_video.get_height_pixels.return_value = height
-
-    resizer = Resizer()
-
+def test_calc_batches(width, height, num_frames, gpu_available, face_detect_width, n_face_detect_batches, expected_batches, resizer):
+    video = _FakeVideoFile(width, height)
     with patch("torch.cuda.is_available", return_value=gpu_available), patch(
         "clipsai.utils.pytorch.get_free_cpu_memory", return_value=8e9
     ):
         n_batches = resizer._calc_n_batches(
-            video_file=mock_video,
+            video_file=video,
             num_frames=num_frames,
             face_detect_width=face_detect_width,
             n_face_detect_batches=n_face_detect_batches,
@@ -109,8 +157,7 @@ def test_calc_batches(width, height, num_frames, gpu_available, face_detect_widt
         (Rect(800, 600, 100, 100), 200, 400, Rect(750, 450, 200, 400)),
     ],
 )
-def test_crop_coordinates(roi, resize_width, resize_height, expected_crop):
-    resizer = Resizer()
+def test_crop_coordinates(roi, resize_width, resize_height, expected_crop, resizer):
     crop = resizer._calc_crop(roi, resize_width, resize_height)
     assert crop == expected_crop
 
@@ -139,12 +186,17 @@ def test_crop_coordinates(roi, resize_width, resize_height, expected_crop):
           {"x": 101, "y": 0, "start_time": 10, "end_time": 20}],
          [{"x": 100, "y": 0, "start_time": 0, "end_time": 20}]),
     ],
+    ids=[
+        "different_x",
+        "same_position",
+        "three_same_positions",
+        "different_y",
+        "single_segment",
+        "no_segments",
+        "within_tolerance",
+    ],
 )
-def test_merge_identicals(segments, expected):
-    mock_video = MagicMock(spec=VideoFile)
-    mock_video.get_width_pixels.return_value = 1000
-    mock_video.get_height_pixels.return_value = 1000
-
-    resizer = Resizer()
-    result = resizer._merge_identical_segments(segments, mock_video)
+def test_merge_identicals(segments, expected, resizer):
+    video = _FakeVideoFile(1000, 1000)
+    result = resizer._merge_identical_segments(segments, video)
     assert result == expected